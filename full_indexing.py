@@ -1,7 +1,6 @@
 """Скрипт для потоковой индексации архива документации 1С порциями."""
 
 import asyncio
-import sys
 import time
 import warnings
 import argparse
@@ -13,8 +12,6 @@ import concurrent.futures
 # Отключаем предупреждения от внешних библиотек
 warnings.filterwarnings("ignore", category=FutureWarning, module="soupsieve")
 
-sys.path.insert(0, str(Path(__file__).parent))
-
 from src.core.config import settings
 from src.core.elasticsearch import es_client
 from src.parsers.hbk_parser import HBKParser
@@ -1,11 +1,9 @@
 """FastAPI Dependencies для Dependency Injection."""
 
-from typing import AsyncGenerator
-from fastapi import Depends
+from typing import Annotated
+from fastapi import Depends, Request
 
 from src.core.elasticsearch import ElasticsearchClient
-from src.core.metrics import get_metrics_collector, get_system_monitor
-from src.core.rate_limiter import get_rate_limiter
 from src.core.logging import get_logger
 from src.infrastructure.background.indexing_manager import get_indexing_manager as _get_indexing_manager, BackgroundIndexingManager
 
@@ -16,36 +14,25 @@ logger = get_logger(__name__)
 # Elasticsearch Client Dependency
 # ============================================================================
 
-async def get_elasticsearch_client() -> AsyncGenerator[ElasticsearchClient, None]:
+async def get_elasticsearch_client(request: Request) -> ElasticsearchClient:
     """
     Dependency для получения Elasticsearch клиента.
     
-    Создаёт новый клиент для каждого запроса, подключается к ES,
-    и корректно закрывает соединение после завершения запроса.
+    Возвращает общий клиент, созданный один раз при запуске приложения
+    (см. `src.core.lifecycle.startup`). Пул соединений к ES переиспользуется
+    между запросами, поэтому подключение на каждый запрос не выполняется.
     
-    Yields:
-        ElasticsearchClient: Подключённый клиент Elasticsearch
+    Returns:
+        ElasticsearchClient: Общий клиент Elasticsearch из app.state
     """
-    client = ElasticsearchClient()
-    
-    try:
-        # Подключаемся к Elasticsearch
-        connected = await client.connect()
-        if not connected:
-            logger.warning("Failed to connect to Elasticsearch in dependency")
-        
-        yield client
-        
-    finally:
-        # Закрываем соединение после завершения запроса
-        await client.disconnect()
+    return request.app.state.es_client
 
 
 # ============================================================================
 # Legacy dependencies (для постепенной миграции)
 # ============================================================================
 
-def get_es_client():
+async def get_es_client():
     """
     Legacy dependency для получения глобального ES клиента.
     TODO: Удалить после полной миграции на get_elasticsearch_client()
@@ -54,21 +41,11 @@ def get_es_client():
     return es_client
 
 
-def get_metrics():
-    """Dependency для получения MetricsCollector."""
-    return get_metrics_collector()
-
-
-def get_limiter():
-    """Dependency для получения RateLimiter."""
-    return get_rate_limiter()
-
-
 # ============================================================================
 # Background Indexing Manager Dependency
 # ============================================================================
 
-def get_indexing_manager() -> BackgroundIndexingManager:
+async def get_indexing_manager() -> BackgroundIndexingManager:
     """
     Dependency для получения менеджера фоновой индексации.
     
@@ -76,3 +53,13 @@ def get_indexing_manager() -> BackgroundIndexingManager:
         BackgroundIndexingManager: Singleton instance менеджера индексации
     """
     return _get_indexing_manager()
+
+
+# ============================================================================
+# Annotated aliases
+# ============================================================================
+# Типы берутся из классов, а не из type(get_...()), поэтому импорт модуля
+# не создаёт singleton'ы раньше первого реального использования.
+
+ElasticsearchClientDep = Annotated[ElasticsearchClient, Depends(get_elasticsearch_client)]
+IndexingManagerDep = Annotated[BackgroundIndexingManager, Depends(get_indexing_manager)]
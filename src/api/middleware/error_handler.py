@@ -1,7 +1,8 @@
 """Exception handlers для API."""
 
+import orjson
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 from src.core.validation import ValidationError
 from src.parsers.hbk_parser import HBKParserError
@@ -9,47 +10,46 @@ from src.core.metrics import get_metrics_collector
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
+_metrics = get_metrics_collector()
+
+# Форма ответов об ошибках фиксирована, меняется только сообщение:
+# тело собирается из готовых байтов и одного экранированного сообщения
+_VALIDATION_PREFIX = b'{"error":"Validation error","message":'
+_PARSER_PREFIX = b'{"error":"Parser error","message":'
+_SUFFIX = b'}'
+_GENERAL_ERROR_BODY = b'{"error":"Internal server error","message":"An unexpected error occurred"}'
 
 
 async def validation_exception_handler(request: Request, exc: ValidationError):
     """Обработчик ошибок валидации."""
-    metrics = get_metrics_collector()
-    await metrics.increment("errors.validation")
-    
-    return JSONResponse(
+    _metrics.increment("errors.validation")
+
+    return Response(
+        content=_VALIDATION_PREFIX + orjson.dumps(str(exc)) + _SUFFIX,
         status_code=400,
-        content={
-            "error": "Validation error",
-            "message": str(exc)
-        }
+        media_type="application/json"
     )
 
 
 async def parser_exception_handler(request: Request, exc: HBKParserError):
     """Обработчик ошибок парсера."""
-    metrics = get_metrics_collector()
-    await metrics.increment("errors.parser")
-    
-    return JSONResponse(
+    _metrics.increment("errors.parser")
+
+    return Response(
+        content=_PARSER_PREFIX + orjson.dumps(str(exc)) + _SUFFIX,
         status_code=500,
-        content={
-            "error": "Parser error", 
-            "message": str(exc)
-        }
+        media_type="application/json"
     )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Общий обработчик исключений."""
-    metrics = get_metrics_collector()
-    await metrics.increment("errors.general")
-    
+    _metrics.increment("errors.general")
+
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    
-    return JSONResponse(
+
+    return Response(
+        content=_GENERAL_ERROR_BODY,
         status_code=500,
-        content={
-            "error": "Internal server error",
-            "message": "An unexpected error occurred"
-        }
+        media_type="application/json"
     )
@@ -0,0 +1,53 @@
+"""ASGI перехватчик liveness-проб."""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class HealthCheckInterceptor:
+    """
+    Отвечает на liveness-пробы до входа в стек FastAPI.
+
+    Пути из LIVENESS_PATHS обслуживаются заранее сериализованным ответом:
+    без middleware, rate limiting, dependency injection и обращений к
+    Elasticsearch. Полная проверка состояния остаётся на `/health`.
+    """
+
+    LIVENESS_PATHS = frozenset({"/health/live", "/healthz"})
+
+    _OK_BODY = b'{"status":"ok"}'
+    _OK_HEADERS = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_OK_BODY)).encode()),
+    ]
+    _METHOD_NOT_ALLOWED_HEADERS = [
+        (b"allow", b"GET, HEAD"),
+        (b"content-length", b"0"),
+    ]
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.LIVENESS_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method == "GET" or method == "HEAD":
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": self._OK_HEADERS,
+            })
+            await send({
+                "type": "http.response.body",
+                "body": self._OK_BODY if method == "GET" else b"",
+            })
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 405,
+            "headers": self._METHOD_NOT_ALLOWED_HEADERS,
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -1,8 +1,8 @@
 """Rate limiting middleware."""
 
-import time
-from fastapi import Request
-from fastapi.responses import JSONResponse
+import asyncio
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.core.rate_limiter import get_rate_limiter, RateLimitExceeded
 from src.core.metrics import get_metrics_collector
@@ -11,48 +11,78 @@ from src.core.logging import get_logger
 logger = get_logger(__name__)
 
 
-async def rate_limit_middleware(request: Request, call_next):
-    """Middleware для ограничения скорости запросов."""
-    rate_limiter = get_rate_limiter()
-    metrics = get_metrics_collector()
-    
-    # Получаем IP клиента
-    client_ip = request.client.host if request.client else "unknown"
-    
-    try:
-        # Проверяем rate limit
-        await rate_limiter.check_rate_limit(client_ip)
-        
+class RateLimitMiddleware:
+    """
+    ASGI middleware для ограничения скорости запросов.
+
+    Реализован как «чистый» ASGI middleware, а не через BaseHTTPMiddleware:
+    не создаёт task group и потоки памяти на каждый запрос и не буферизует тело.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._rate_limiter = get_rate_limiter()
+        self._metrics = get_metrics_collector()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rate_limiter = self._rate_limiter
+        metrics = self._metrics
+
+        # Получаем IP клиента
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+        try:
+            # Проверяем rate limit
+            rate_limiter.check_rate_limit(client_ip)
+        except RateLimitExceeded as e:
+            metrics.increment("requests.rate_limited", labels={"client_ip": client_ip})
+
+            response = ORJSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate limit exceeded",
+                    "message": str(e),
+                    "retry_after": e.retry_after
+                },
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        except Exception as e:
+            # Внутренняя ошибка ограничителя: завершаем запрос здесь, не передавая
+            # его дальше по цепочке, чтобы он обрабатывался ровно один раз
+            metrics.increment("requests.middleware_error")
+            logger.error(f"Error in rate limit middleware: {e}")
+
+            response = ORJSONResponse(status_code=500, content={"error": "internal"})
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         # Измеряем время выполнения запроса
-        start_time = time.time()
-        response = await call_next(request)
-        response_time = time.time() - start_time
-        
-        # Записываем метрики
-        await metrics.record_timer("request.duration", response_time, 
-                                 {"method": request.method, "path": request.url.path})
-        await metrics.update_performance_stats(
-            success=200 <= response.status_code < 400,
-            response_time=response_time
-        )
-        
-        return response
-        
-    except RateLimitExceeded as e:
-        await metrics.increment("requests.rate_limited", labels={"client_ip": client_ip})
-        
-        return JSONResponse(
-            status_code=429,
-            content={
-                "error": "Rate limit exceeded",
-                "message": str(e),
-                "retry_after": e.retry_after
-            },
-            headers={"Retry-After": str(e.retry_after)}
-        )
-    except Exception as e:
-        await metrics.increment("requests.middleware_error")
-        logger.error(f"Error in rate limit middleware: {e}")
-        
-        response = await call_next(request)
-        return response
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            response_time = loop.time() - start_time
+
+            # Записываем метрики
+            metrics.record_timer("request.duration", response_time,
+                                 {"method": scope["method"], "path": scope["path"]})
+            metrics.update_performance_stats(
+                success=200 <= status_code < 400,
+                response_time=response_time
+            )
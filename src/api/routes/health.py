@@ -1,22 +1,23 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, Depends
+import asyncio
+from fastapi import APIRouter
 
 from src.models.mcp_models import HealthResponse
-from src.core.elasticsearch import ElasticsearchClient
-from src.core.metrics import get_metrics_collector
 from src.core.config import settings
-from src.api.dependencies import get_elasticsearch_client, get_indexing_manager
-from src.infrastructure.background.indexing_manager import BackgroundIndexingManager
+from src.core.metrics import get_metrics_collector
+from src.api.dependencies import ElasticsearchClientDep, IndexingManagerDep
 
 router = APIRouter(tags=["health"])
+_metrics = get_metrics_collector()
 
 
-@router.get("/health", response_model=HealthResponse)
+# Модель указана только для документации: ответ собирается сервером
+# и не проходит повторную валидацию
+@router.get("/health", responses={200: {"model": HealthResponse}})
 async def health_check(
-    es_client: ElasticsearchClient = Depends(get_elasticsearch_client),
-    indexing_manager: BackgroundIndexingManager = Depends(get_indexing_manager),
-    metrics=Depends(get_metrics_collector)
+    es_client: ElasticsearchClientDep,
+    indexing_manager: IndexingManagerDep
 ):
     """
     Проверка состояния системы.
@@ -27,19 +28,28 @@ async def health_check(
     - Состоянии индекса
     - Статусе фоновой индексации
     """
-    async with metrics.timer("health_check.duration"):
-        # Клиент уже подключён через dependency
-        es_connected = await es_client.is_connected()
-        index_exists = bool(await es_client.index_exists()) if es_connected else False
-        docs_count = await es_client.get_documents_count() if index_exists else None
+    async with _metrics.timer("health_check.duration"):
+        # Проверка ES и статус фоновой индексации независимы — выполняем параллельно
+        es_connected, indexing_progress = await asyncio.gather(
+            es_client.is_connected(),
+            indexing_manager.get_status()
+        )
         
-        # Получаем статус фоновой индексации
-        indexing_progress = await indexing_manager.get_status()
+        index_exists = False
+        docs_count = None
+        if es_connected:
+            index_exists, docs_count = await asyncio.gather(
+                es_client.index_exists(),
+                es_client.get_documents_count()
+            )
+            index_exists = bool(index_exists)
+            if not index_exists:
+                docs_count = None
     
-    await metrics.increment("health_check.requests")
+    _metrics.increment("health_check.requests")
     
     # Приложение считается healthy даже во время индексации
-    return HealthResponse(
+    return HealthResponse.model_construct(
         status="healthy" if es_connected else "unhealthy",
         elasticsearch=es_connected,
         index_exists=index_exists,
@@ -1,14 +1,14 @@
 """Index management endpoints."""
 
+import asyncio
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException
 
 from src.core.config import settings
-from src.core.elasticsearch import ElasticsearchClient
 from src.core.logging import get_logger
 from src.core.startup import index_hbk_file
-from src.api.dependencies import get_elasticsearch_client, get_indexing_manager
-from src.infrastructure.background.indexing_manager import BackgroundIndexingManager
+from src.core.utils import find_first_file
+from src.api.dependencies import ElasticsearchClientDep, IndexingManagerDep
 
 router = APIRouter(prefix="/index", tags=["index"])
 logger = get_logger(__name__)
@@ -16,8 +16,8 @@ logger = get_logger(__name__)
 
 @router.get("/status")
 async def index_status(
-    es_client: ElasticsearchClient = Depends(get_elasticsearch_client),
-    indexing_manager: BackgroundIndexingManager = Depends(get_indexing_manager)
+    es_client: ElasticsearchClientDep,
+    indexing_manager: IndexingManagerDep
 ):
     """
     Получить статус индекса и фоновой индексации.
@@ -28,13 +28,21 @@ async def index_status(
     - Количество документов в индексе
     - Статус фоновой индексации (если активна)
     """
-    # Информация об Elasticsearch индексе
-    es_connected = await es_client.is_connected()
-    index_exists = await es_client.index_exists() if es_connected else False
-    docs_count = await es_client.get_documents_count() if index_exists else 0
+    # Информация об Elasticsearch индексе и о фоновой индексации (параллельно)
+    es_connected, progress = await asyncio.gather(
+        es_client.is_connected(),
+        indexing_manager.get_status()
+    )
     
-    # Информация о фоновой индексации
-    progress = await indexing_manager.get_status()
+    index_exists = False
+    docs_count = 0
+    if es_connected:
+        index_exists, docs_count = await asyncio.gather(
+            es_client.index_exists(),
+            es_client.get_documents_count()
+        )
+        if not index_exists:
+            docs_count = 0
     
     return {
         "elasticsearch_connected": es_connected,
@@ -50,7 +58,7 @@ async def index_status(
 
 @router.post("/rebuild")
 async def rebuild_index(
-    es_client: ElasticsearchClient = Depends(get_elasticsearch_client)
+    es_client: ElasticsearchClientDep
 ):
     """Переиндексация документации из .hbk файла."""
     try:
@@ -61,23 +69,22 @@ async def rebuild_index(
                 detail="Elasticsearch недоступен"
             )
         
-        # Ищем .hbk файлы
+        # Ищем первый .hbk файл
         hbk_dir = Path(settings.data.hbk_directory)
-        if not hbk_dir.exists():
+        try:
+            hbk_file = find_first_file(hbk_dir, ".hbk")
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=400,
                 detail=f"Директория .hbk файлов не найдена: {hbk_dir}"
             )
         
-        hbk_files = list(hbk_dir.glob("*.hbk"))
-        if not hbk_files:
+        if hbk_file is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"Файлы .hbk не найдены в {hbk_dir}"
             )
         
-        # Индексируем первый найденный файл
-        hbk_file = hbk_files[0]
         logger.info(f"Начинаем переиндексацию файла: {hbk_file}")
         
         success = await index_hbk_file(str(hbk_file), es_client)
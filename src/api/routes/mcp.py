@@ -1,162 +1,203 @@
 """MCP protocol endpoints."""
 
-import json
 import asyncio
 import time
-from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse, StreamingResponse
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+import orjson
+from pydantic import BaseModel
+from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 from src.core.logging import get_logger
 from src.core.elasticsearch import ElasticsearchClient
-from src.api.dependencies import get_elasticsearch_client
+from src.api.dependencies import ElasticsearchClientDep
 from src.models.mcp_models import (
-    MCPRequest, MCPResponse, MCPToolsResponse, MCPTool, MCPToolParameter, MCPToolType,
+    MCPResponse, MCPToolsResponse, MCPTool, MCPToolParameter, MCPToolType,
     Find1CHelpRequest, GetSyntaxInfoRequest, GetQuickReferenceRequest,
     SearchByContextRequest, ListObjectMembersRequest
 )
-from src.handlers.mcp_handlers import (
-    handle_find_1c_help, handle_get_syntax_info, handle_get_quick_reference,
-    handle_search_by_context, handle_list_object_members
-)
 
 router = APIRouter(prefix="/mcp", tags=["mcp"])
 logger = get_logger(__name__)
 
+# Форма SSE событий фиксирована, поэтому кадры собираются из готовых байтов
+_SSE_CONNECT_EVENT = b'data: {"type":"connection","status":"connected"}\n\n'
+_SSE_PING_PREFIX = b'data: {"type":"ping","timestamp":'
+_SSE_PING_SUFFIX = b'}\n\n'
+
+# Максимальный размер тела JSON-RPC запроса
+MAX_MCP_BODY = 256 * 1024
+
 
-@router.get("/tools", response_model=MCPToolsResponse)
+# Список инструментов неизменен, поэтому модели и JSON-схема для tools/list
+# строятся один раз при импорте модуля
+_TOOLS_RESPONSE = MCPToolsResponse(tools=[
+    MCPTool(
+        name=MCPToolType.FIND_1C_HELP,
+        description="Универсальный поиск справки по любому элементу 1С",
+        parameters=[
+            MCPToolParameter(
+                name="query",
+                type="string",
+                description="Поисковый запрос (имя элемента, описание, ключевые слова)",
+                required=True
+            ),
+            MCPToolParameter(
+                name="limit",
+                type="number",
+                description="Максимальное количество результатов (по умолчанию: 10)",
+                required=False
+            )
+        ]
+    ),
+    MCPTool(
+        name=MCPToolType.GET_SYNTAX_INFO,
+        description="Получить полную техническую информацию об элементе с синтаксисом и параметрами",
+        parameters=[
+            MCPToolParameter(
+                name="element_name",
+                type="string",
+                description="Имя элемента (функции, метода, свойства)",
+                required=True
+            ),
+            MCPToolParameter(
+                name="object_name",
+                type="string",
+                description="Имя объекта (для методов объектов)",
+                required=False
+            ),
+            MCPToolParameter(
+                name="include_examples",
+                type="boolean",
+                description="Включить примеры использования",
+                required=False
+            )
+        ]
+    ),
+    MCPTool(
+        name=MCPToolType.GET_QUICK_REFERENCE,
+        description="Получить краткую справку об элементе (только синтаксис и описание)",
+        parameters=[
+            MCPToolParameter(
+                name="element_name",
+                type="string",
+                description="Имя элемента",
+                required=True
+            ),
+            MCPToolParameter(
+                name="object_name",
+                type="string",
+                description="Имя объекта (необязательно)",
+                required=False
+            )
+        ]
+    ),
+    MCPTool(
+        name=MCPToolType.SEARCH_BY_CONTEXT,
+        description="Поиск элементов с фильтром по контексту (глобальные функции или методы объектов)",
+        parameters=[
+            MCPToolParameter(
+                name="query",
+                type="string",
+                description="Поисковый запрос",
+                required=True
+            ),
+            MCPToolParameter(
+                name="context",
+                type="string",
+                description="Контекст поиска: global, object, all",
+                required=True
+            ),
+            MCPToolParameter(
+                name="object_name",
+                type="string",
+                description="Фильтр по конкретному объекту (для context=object)",
+                required=False
+            ),
+            MCPToolParameter(
+                name="limit",
+                type="number",
+                description="Максимальное количество результатов",
+                required=False
+            )
+        ]
+    ),
+    MCPTool(
+        name=MCPToolType.LIST_OBJECT_MEMBERS,
+        description="Получить список всех элементов объекта (методы, свойства, события)",
+        parameters=[
+            MCPToolParameter(
+                name="object_name",
+                type="string",
+                description="Имя объекта 1С",
+                required=True
+            ),
+            MCPToolParameter(
+                name="member_type",
+                type="string",
+                description="Тип элементов: all, methods, properties, events",
+                required=False
+            ),
+            MCPToolParameter(
+                name="limit",
+                type="number",
+                description="Максимальное количество результатов",
+                required=False
+            )
+        ]
+    )
+])
+
+_TOOLS_LIST_RESULT_JSON = orjson.dumps({
+    "tools": [
+        {
+            "name": tool.name.value,
+            "description": tool.description,
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    param.name: {
+                        "type": param.type,
+                        "description": param.description
+                    }
+                    for param in tool.parameters
+                },
+                "required": [param.name for param in tool.parameters if param.required]
+            }
+        }
+        for tool in _TOOLS_RESPONSE.tools
+    ]
+})
+
+
+# Список инструментов статичен: сериализуем его один раз при импорте
+_TOOLS_RESPONSE_JSON = orjson.dumps(_TOOLS_RESPONSE.model_dump(mode="json"))
+
+
+@router.get("/tools", responses={200: {"model": MCPToolsResponse}})
 async def get_mcp_tools():
     """Возвращает список доступных MCP инструментов."""
-    tools = [
-        MCPTool(
-            name=MCPToolType.FIND_1C_HELP,
-            description="Универсальный поиск справки по любому элементу 1С",
-            parameters=[
-                MCPToolParameter(
-                    name="query",
-                    type="string",
-                    description="Поисковый запрос (имя элемента, описание, ключевые слова)",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="limit",
-                    type="number",
-                    description="Максимальное количество результатов (по умолчанию: 10)",
-                    required=False
-                )
-            ]
-        ),
-        MCPTool(
-            name=MCPToolType.GET_SYNTAX_INFO,
-            description="Получить полную техническую информацию об элементе с синтаксисом и параметрами",
-            parameters=[
-                MCPToolParameter(
-                    name="element_name",
-                    type="string",
-                    description="Имя элемента (функции, метода, свойства)",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="object_name",
-                    type="string",
-                    description="Имя объекта (для методов объектов)",
-                    required=False
-                ),
-                MCPToolParameter(
-                    name="include_examples",
-                    type="boolean",
-                    description="Включить примеры использования",
-                    required=False
-                )
-            ]
-        ),
-        MCPTool(
-            name=MCPToolType.GET_QUICK_REFERENCE,
-            description="Получить краткую справку об элементе (только синтаксис и описание)",
-            parameters=[
-                MCPToolParameter(
-                    name="element_name",
-                    type="string",
-                    description="Имя элемента",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="object_name",
-                    type="string",
-                    description="Имя объекта (необязательно)",
-                    required=False
-                )
-            ]
-        ),
-        MCPTool(
-            name=MCPToolType.SEARCH_BY_CONTEXT,
-            description="Поиск элементов с фильтром по контексту (глобальные функции или методы объектов)",
-            parameters=[
-                MCPToolParameter(
-                    name="query",
-                    type="string",
-                    description="Поисковый запрос",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="context",
-                    type="string",
-                    description="Контекст поиска: global, object, all",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="object_name",
-                    type="string",
-                    description="Фильтр по конкретному объекту (для context=object)",
-                    required=False
-                ),
-                MCPToolParameter(
-                    name="limit",
-                    type="number",
-                    description="Максимальное количество результатов",
-                    required=False
-                )
-            ]
-        ),
-        MCPTool(
-            name=MCPToolType.LIST_OBJECT_MEMBERS,
-            description="Получить список всех элементов объекта (методы, свойства, события)",
-            parameters=[
-                MCPToolParameter(
-                    name="object_name",
-                    type="string",
-                    description="Имя объекта 1С",
-                    required=True
-                ),
-                MCPToolParameter(
-                    name="member_type",
-                    type="string",
-                    description="Тип элементов: all, methods, properties, events",
-                    required=False
-                ),
-                MCPToolParameter(
-                    name="limit",
-                    type="number",
-                    description="Максимальное количество результатов",
-                    required=False
-                )
-            ]
-        )
-    ]
-    
-    return MCPToolsResponse(tools=tools)
+    return Response(content=_TOOLS_RESPONSE_JSON, media_type="application/json")
 
 
 @router.get("")
-async def mcp_sse_endpoint():
+async def mcp_sse_endpoint(request: Request):
     """MCP Server-Sent Events endpoint для потокового соединения."""
+    loop = asyncio.get_running_loop()
+    # Смещение монотонных часов цикла относительно эпохи: timestamp пинга
+    # считается без системного вызова time.time() на каждой итерации
+    epoch_offset = time.time() - loop.time()
+
     async def event_stream():
         # Отправляем начальное событие подключения
-        yield f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
+        yield _SSE_CONNECT_EVENT
         
-        # Поддерживаем соединение живым
-        while True:
+        # Поддерживаем соединение живым, пока клиент не отключился
+        while not await request.is_disconnected():
             await asyncio.sleep(1)
-            yield f"data: {json.dumps({'type': 'ping', 'timestamp': int(time.time())})}\n\n"
+            timestamp = int(loop.time() + epoch_offset)
+            yield _SSE_PING_PREFIX + str(timestamp).encode() + _SSE_PING_SUFFIX
     
     return StreamingResponse(
         event_stream(), 
@@ -164,24 +205,169 @@ async def mcp_sse_endpoint():
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # GZipMiddleware не сжимает ответы с Content-Encoding: иначе события
+            # копились бы в буфере компрессора и не доходили до клиента
+            "Content-Encoding": "identity",
             "Access-Control-Allow-Origin": "*"
         }
     )
 
 
+async def _rpc_initialize(params: Dict[str, Any], request_id: Any, es_client: ElasticsearchClient) -> Response:
+    """JSON-RPC метод initialize."""
+    return ORJSONResponse(content={
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {
+                "tools": {},
+                "resources": {},
+                "prompts": {},
+                "roots": {"listChanged": False},
+                "sampling": {}
+            },
+            "serverInfo": {
+                "name": "1c-syntax-helper-mcp",
+                "version": "1.0.0"
+            }
+        }
+    })
+
+
+async def _rpc_tools_list(params: Dict[str, Any], request_id: Any, es_client: ElasticsearchClient) -> Response:
+    """JSON-RPC метод tools/list."""
+    # Подставляем id в заранее сериализованный результат
+    return Response(
+        content=b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id)
+                + b',"result":' + _TOOLS_LIST_RESULT_JSON + b'}',
+        media_type="application/json"
+    )
+
+
+async def _rpc_prompts_list(params: Dict[str, Any], request_id: Any, es_client: ElasticsearchClient) -> Response:
+    """JSON-RPC метод prompts/list."""
+    return ORJSONResponse(content={
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "prompts": []
+        }
+    })
+
+
+async def _rpc_notifications_initialized(params: Dict[str, Any], request_id: Any, es_client: ElasticsearchClient) -> Response:
+    """JSON-RPC уведомление notifications/initialized (без ответа)."""
+    return ORJSONResponse(content={"status": "ok"})
+
+
+async def _rpc_tools_call(params: Dict[str, Any], request_id: Any, es_client: ElasticsearchClient) -> Response:
+    """JSON-RPC метод tools/call."""
+    # Тело уже разобрано orjson: имя и аргументы передаются обработчику
+    # напрямую, без промежуточной модели MCPRequest
+    result = await mcp_endpoint_handler(params.get("name"), params.get("arguments", {}), es_client)
+    
+    return ORJSONResponse(content={
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": result.content if hasattr(result, 'content') else result,
+            "isError": False
+        }
+    })
+
+
+# Таблица JSON-RPC методов: поиск обработчика — один dict lookup вместо цепочки elif
+_JSONRPC_METHODS: Dict[str, Callable[[Dict[str, Any], Any, ElasticsearchClient], Awaitable[Response]]] = {
+    "initialize": _rpc_initialize,
+    "tools/list": _rpc_tools_list,
+    "prompts/list": _rpc_prompts_list,
+    "notifications/initialized": _rpc_notifications_initialized,
+    "tools/call": _rpc_tools_call,
+}
+
+# Обработчики инструментов импортируются при первом вызове: модуль обработчиков
+# тянет поиск и форматирование, которые не нужны для старта сервера
+_ToolEntry = Tuple[Type[BaseModel], Callable[..., Awaitable[MCPResponse]]]
+
+
+@lru_cache(maxsize=None)
+def _load_find_1c_help() -> _ToolEntry:
+    from src.handlers.mcp_handlers import handle_find_1c_help
+    return Find1CHelpRequest, handle_find_1c_help
+
+
+@lru_cache(maxsize=None)
+def _load_get_syntax_info() -> _ToolEntry:
+    from src.handlers.mcp_handlers import handle_get_syntax_info
+    return GetSyntaxInfoRequest, handle_get_syntax_info
+
+
+@lru_cache(maxsize=None)
+def _load_get_quick_reference() -> _ToolEntry:
+    from src.handlers.mcp_handlers import handle_get_quick_reference
+    return GetQuickReferenceRequest, handle_get_quick_reference
+
+
+@lru_cache(maxsize=None)
+def _load_search_by_context() -> _ToolEntry:
+    from src.handlers.mcp_handlers import handle_search_by_context
+    return SearchByContextRequest, handle_search_by_context
+
+
+@lru_cache(maxsize=None)
+def _load_list_object_members() -> _ToolEntry:
+    from src.handlers.mcp_handlers import handle_list_object_members
+    return ListObjectMembersRequest, handle_list_object_members
+
+
+# Таблица MCP инструментов: загрузчик модели аргументов и обработчика
+_TOOL_DISPATCH: Dict[MCPToolType, Callable[[], _ToolEntry]] = {
+    MCPToolType.FIND_1C_HELP: _load_find_1c_help,
+    MCPToolType.GET_SYNTAX_INFO: _load_get_syntax_info,
+    MCPToolType.GET_QUICK_REFERENCE: _load_get_quick_reference,
+    MCPToolType.SEARCH_BY_CONTEXT: _load_search_by_context,
+    MCPToolType.LIST_OBJECT_MEMBERS: _load_list_object_members,
+}
+
+
+def _body_too_large_response() -> ORJSONResponse:
+    """Ответ на запрос с телом больше MAX_MCP_BODY."""
+    return ORJSONResponse(
+        status_code=413,
+        content={"error": {"code": -32600, "message": f"Request body exceeds {MAX_MCP_BODY} bytes"}}
+    )
+
+
 @router.post("")
 async def mcp_jsonrpc_endpoint(
     request: Request,
-    es_client: ElasticsearchClient = Depends(get_elasticsearch_client)
+    es_client: ElasticsearchClientDep
 ):
     """MCP JSON-RPC endpoint для обработки MCP протокола."""
+    request_id = None
     try:
-        body = await request.body()
-        data = json.loads(body.decode('utf-8'))
+        # Отклоняем слишком большие запросы до чтения тела. Некорректный
+        # Content-Length игнорируем: размер все равно ограничен при чтении потока
+        content_length = request.headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > MAX_MCP_BODY:
+            return _body_too_large_response()
+        
+        # Chunked-запросы приходят без Content-Length: читаем поток с ограничением
+        chunks = []
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_MCP_BODY:
+                return _body_too_large_response()
+            chunks.append(chunk)
+        body = b"".join(chunks)
+        
+        data = orjson.loads(body)
         
         # Проверяем JSON-RPC формат
         if data.get("jsonrpc") != "2.0":
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={"error": {"code": -32600, "message": "Invalid Request"}}
             )
@@ -190,91 +376,9 @@ async def mcp_jsonrpc_endpoint(
         params = data.get("params", {})
         request_id = data.get("id")
         
-        # Обрабатываем initialize запрос
-        if method == "initialize":
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2025-06-18",
-                    "capabilities": {
-                        "tools": {},
-                        "resources": {},
-                        "prompts": {},
-                        "roots": {"listChanged": False},
-                        "sampling": {}
-                    },
-                    "serverInfo": {
-                        "name": "1c-syntax-helper-mcp",
-                        "version": "1.0.0"
-                    }
-                }
-            })
-        
-        # Обрабатываем tools/list запрос
-        elif method == "tools/list":
-            tools_response = await get_mcp_tools()
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "tools": [
-                        {
-                            "name": tool.name,
-                            "description": tool.description,
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    param.name: {
-                                        "type": param.type,
-                                        "description": param.description
-                                    }
-                                    for param in tool.parameters
-                                },
-                                "required": [param.name for param in tool.parameters if param.required]
-                            }
-                        }
-                        for tool in tools_response.tools
-                    ]
-                }
-            })
-        
-        # Обрабатываем prompts/list запрос
-        elif method == "prompts/list":
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "prompts": []
-                }
-            })
-        
-        # Обрабатываем notifications/initialized (без ответа)
-        elif method == "notifications/initialized":
-            return JSONResponse(content={"status": "ok"})
-        
-        # Обрабатываем tools/call запрос
-        elif method == "tools/call":
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            # Преобразуем в наш формат MCPRequest
-            mcp_request = MCPRequest(tool=tool_name, arguments=arguments)
-            
-            # Вызываем наш существующий обработчик
-            result = await mcp_endpoint_handler(mcp_request, es_client)
-            
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": result.content if hasattr(result, 'content') else result,
-                    "isError": False
-                }
-            })
-        
-        else:
-            return JSONResponse(
+        handler = _JSONRPC_METHODS.get(method)
+        if handler is None:
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "jsonrpc": "2.0",
@@ -282,27 +386,29 @@ async def mcp_jsonrpc_endpoint(
                     "error": {"code": -32601, "message": f"Method not found: {method}"}
                 }
             )
+        
+        return await handler(params, request_id, es_client)
             
-    except json.JSONDecodeError:
-        return JSONResponse(
+    except orjson.JSONDecodeError:
+        return ORJSONResponse(
             status_code=400,
             content={"error": {"code": -32700, "message": "Parse error"}}
         )
     except Exception as e:
         logger.error(f"Ошибка в MCP JSON-RPC endpoint: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "jsonrpc": "2.0",
-                "id": request_id if 'request_id' in locals() else None,
+                "id": request_id,
                 "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
             }
         )
 
 
-async def mcp_endpoint_handler(request: MCPRequest, es_client: ElasticsearchClient):
+async def mcp_endpoint_handler(tool: Any, arguments: Any, es_client: ElasticsearchClient):
     """Внутренний обработчик MCP запросов."""
-    logger.info(f"Получен MCP запрос: {request.tool}")
+    logger.info(f"Получен MCP запрос: {tool}")
     
     try:
         # Проверяем подключение к Elasticsearch
@@ -312,22 +418,17 @@ async def mcp_endpoint_handler(request: MCPRequest, es_client: ElasticsearchClie
                 detail="Elasticsearch недоступен"
             )
         
-        # Маршрутизируем запрос к новым обработчикам
-        if request.tool == MCPToolType.FIND_1C_HELP:
-            return await handle_find_1c_help(Find1CHelpRequest(**request.arguments), es_client)
-        elif request.tool == MCPToolType.GET_SYNTAX_INFO:
-            return await handle_get_syntax_info(GetSyntaxInfoRequest(**request.arguments), es_client)
-        elif request.tool == MCPToolType.GET_QUICK_REFERENCE:
-            return await handle_get_quick_reference(GetQuickReferenceRequest(**request.arguments), es_client)
-        elif request.tool == MCPToolType.SEARCH_BY_CONTEXT:
-            return await handle_search_by_context(SearchByContextRequest(**request.arguments), es_client)
-        elif request.tool == MCPToolType.LIST_OBJECT_MEMBERS:
-            return await handle_list_object_members(ListObjectMembersRequest(**request.arguments), es_client)
-        else:
+        # Маршрутизируем запрос к обработчику инструмента. MCPToolType — str Enum,
+        # поэтому строка из запроса находит элемент таблицы без преобразования
+        load_tool = _TOOL_DISPATCH.get(tool) if isinstance(tool, str) else None
+        if load_tool is None:
             raise HTTPException(
                 status_code=400,
-                detail=f"Неизвестный инструмент: {request.tool}"
+                detail=f"Неизвестный инструмент: {tool}"
             )
+        
+        request_model, handler = load_tool()
+        return await handler(request_model.model_validate(arguments), es_client)
             
     except Exception as e:
         logger.error(f"Ошибка обработки MCP запроса: {e}")
@@ -1,22 +1,21 @@
 """Metrics endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 
 from src.core.metrics import get_metrics_collector
 from src.core.rate_limiter import get_rate_limiter
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
+_metrics = get_metrics_collector()
+_rate_limiter = get_rate_limiter()
 
 
 @router.get("")
-async def get_metrics(
-    metrics=Depends(get_metrics_collector),
-    rate_limiter=Depends(get_rate_limiter)
-):
+async def get_metrics():
     """Получение метрик системы."""
-    all_metrics = await metrics.get_all_metrics()
-    performance_stats = metrics.performance_stats
-    global_rate_stats = rate_limiter.get_global_stats()
+    all_metrics = await _metrics.get_all_metrics_snapshot()
+    performance_stats = _metrics.performance_stats
+    global_rate_stats = _rate_limiter.get_global_stats()
     
     return {
         "metrics": all_metrics,
@@ -35,9 +34,9 @@ async def get_metrics(
 
 
 @router.get("/{client_id}")
-async def get_client_metrics(client_id: str, rate_limiter=Depends(get_rate_limiter)):
+async def get_client_metrics(client_id: str):
     """Получение метрик для конкретного клиента."""
-    client_stats = rate_limiter.get_client_stats(client_id)
+    client_stats = _rate_limiter.get_client_stats(client_id)
     
     return {
         "client_id": client_id,
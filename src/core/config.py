@@ -1,7 +1,8 @@
 """Конфигурация приложения."""
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings
+from functools import cached_property
 from typing import Optional
 import os
 
@@ -42,6 +43,11 @@ class Settings(BaseSettings):
     # Сервер настройки
     server_host: str = "0.0.0.0"
     server_port: int = 8000
+    # Число процессов uvicorn; WEB_CONCURRENCY — общепринятое имя переменной
+    server_workers: int = Field(
+        default=1,
+        validation_alias=AliasChoices("server_workers", "web_concurrency")
+    )
     log_level: str = "INFO"
     
     # Пути к данным
@@ -67,7 +73,9 @@ class Settings(BaseSettings):
         case_sensitive=False
     )
     
-    @property
+    # Вложенные конфигурации строятся один раз на экземпляр Settings:
+    # поля, из которых они собираются, во время работы не меняются
+    @cached_property
     def elasticsearch(self) -> ElasticsearchConfig:
         """Получить конфигурацию Elasticsearch."""
         # Формируем URL из host и port
@@ -80,16 +88,17 @@ class Settings(BaseSettings):
             max_retries=int(self.elasticsearch_max_retries)
         )
     
-    @property
+    @cached_property
     def server(self) -> ServerConfig:
         """Получить конфигурацию сервера."""
         return ServerConfig(
             host=self.server_host,
             port=self.server_port,
+            workers=self.server_workers,
             log_level=self.log_level
         )
     
-    @property
+    @cached_property
     def data(self) -> DataConfig:
         """Получить конфигурацию данных."""
         return DataConfig(
@@ -2,23 +2,70 @@
 Модуль Dependency Injection для управления зависимостями.
 """
 
-from typing import Any, Dict, Type, TypeVar, Optional, Callable
+from typing import Any, Dict, Tuple, Type, TypeVar, Optional, Callable
 from abc import ABC, abstractmethod
 import inspect
-from src.core.logging import get_logger
+from src.core.logging import get_logger, DEBUG_ENABLED
 
 logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# Виды записей реестра контейнера
+_INSTANCE = 0  # singleton или конкретный экземпляр
+_FACTORY = 1   # фабрика, вызываемая при каждом get
+
+# Маркер отсутствующего значения по умолчанию у параметра конструктора
+_MISSING = object()
+
+# Кэш параметров конструкторов для resolve: (имя, аннотация или None, значение по умолчанию или _MISSING)
+_SIG_CACHE: Dict[type, Tuple[Tuple[str, Any, Any], ...]] = {}
+
+
+def _get_init_params(cls: type) -> Tuple[Tuple[str, Any, Any], ...]:
+    """Параметры конструктора класса без self, извлекаются один раз на класс."""
+    params = _SIG_CACHE.get(cls)
+    if params is None:
+        empty = inspect.Parameter.empty
+        sig = inspect.signature(cls.__init__)
+        params = tuple(
+            (
+                param_name,
+                param.annotation if param.annotation and param.annotation is not empty else None,
+                _MISSING if param.default is empty else param.default
+            )
+            for param_name, param in sig.parameters.items()
+            if param_name != 'self'
+        )
+        _SIG_CACHE[cls] = params
+    return params
+
 
 class DIContainer:
     """Контейнер для dependency injection."""
     
     def __init__(self):
-        self._services: Dict[str, Any] = {}
-        self._factories: Dict[str, Callable] = {}
-        self._singletons: Dict[str, Any] = {}
+        # Единый реестр: имя сервиса -> (вид записи, экземпляр или фабрика)
+        self._registry: Dict[str, Tuple[int, Any]] = {}
+        # Быстрый путь для get без имени: тип -> та же запись реестра
+        self._by_type: Dict[type, Tuple[int, Any]] = {}
+    
+    def _register(self, interface: type, name: Optional[str], kind: int, value: Any, label: str):
+        """Общая запись сервиса в реестр и в быстрый индекс по типу."""
+        type_name = interface.__name__
+        service_name = name or type_name
+        entry = (kind, value)
+        self._registry[service_name] = entry
+        by_type = self._by_type
+        if service_name == type_name:
+            by_type[interface] = entry
+        else:
+            # Запись под чужим именем типа заменяет его в реестре: быстрый индекс
+            # не должен возвращать прежнее значение для этого типа
+            for cls in [cls for cls in by_type if cls.__name__ == service_name]:
+                del by_type[cls]
+        if DEBUG_ENABLED:
+            logger.debug("Registered %s: %s", label, service_name)
     
     def register_singleton(self, interface: Type[T], implementation: T, name: Optional[str] = None):
         """
@@ -29,9 +76,7 @@ class DIContainer:
             implementation: Реализация
             name: Имя сервиса (опционально)
         """
-        service_name = name or interface.__name__
-        self._singletons[service_name] = implementation
-        logger.debug(f"Registered singleton: {service_name}")
+        self._register(interface, name, _INSTANCE, implementation, "singleton")
     
     def register_factory(self, interface: Type[T], factory: Callable[[], T], name: Optional[str] = None):
         """
@@ -42,9 +87,7 @@ class DIContainer:
             factory: Фабричная функция
             name: Имя сервиса (опционально)
         """
-        service_name = name or interface.__name__
-        self._factories[service_name] = factory
-        logger.debug(f"Registered factory: {service_name}")
+        self._register(interface, name, _FACTORY, factory, "factory")
     
     def register_instance(self, interface: Type[T], instance: T, name: Optional[str] = None):
         """
@@ -55,9 +98,7 @@ class DIContainer:
             instance: Экземпляр
             name: Имя сервиса (опционально)
         """
-        service_name = name or interface.__name__
-        self._services[service_name] = instance
-        logger.debug(f"Registered instance: {service_name}")
+        self._register(interface, name, _INSTANCE, instance, "instance")
     
     def get(self, interface: Type[T], name: Optional[str] = None) -> T:
         """
@@ -73,22 +114,16 @@ class DIContainer:
         Raises:
             DIError: Если сервис не найден
         """
-        service_name = name or interface.__name__
+        entry = self._by_type.get(interface) if name is None else None
+        if entry is None:
+            service_name = name or interface.__name__
+            entry = self._registry.get(service_name)
+            if entry is None:
+                raise DIError(f"Service not found: {service_name}")
         
-        # Проверяем singleton
-        if service_name in self._singletons:
-            return self._singletons[service_name]
-        
-        # Проверяем обычные экземпляры
-        if service_name in self._services:
-            return self._services[service_name]
-        
-        # Создаем через фабрику
-        if service_name in self._factories:
-            instance = self._factories[service_name]()
-            return instance
-        
-        raise DIError(f"Service not found: {service_name}")
+        kind, value = entry
+        # Singleton и экземпляры возвращаем как есть, фабрику вызываем
+        return value if kind == _INSTANCE else value()
     
     def resolve(self, cls: Type[T]) -> T:
         """
@@ -101,24 +136,18 @@ class DIContainer:
             Экземпляр класса с внедренными зависимостями
         """
         try:
-            # Получаем сигнатуру конструктора
-            sig = inspect.signature(cls.__init__)
             params = {}
             
-            for param_name, param in sig.parameters.items():
-                if param_name == 'self':
-                    continue
-                
+            for param_name, annotation, default in _get_init_params(cls):
                 # Пытаемся найти зависимость по типу
-                if param.annotation and param.annotation != inspect.Parameter.empty:
+                if annotation is not None:
                     try:
-                        params[param_name] = self.get(param.annotation)
+                        params[param_name] = self.get(annotation)
                     except DIError:
-                        # Если зависимость не найдена и есть значение по умолчанию
-                        if param.default != inspect.Parameter.empty:
-                            params[param_name] = param.default
-                        else:
-                            raise DIError(f"Cannot resolve dependency: {param_name} of type {param.annotation}")
+                        # Если зависимость не найдена и нет значения по умолчанию
+                        if default is _MISSING:
+                            raise DIError(f"Cannot resolve dependency: {param_name} of type {annotation}")
+                        params[param_name] = default
             
             return cls(**params)
             
@@ -173,8 +202,8 @@ class IIndexer(ABC):
         pass
 
 
-# Глобальный контейнер
-_global_container: Optional[DIContainer] = None
+# Глобальный контейнер создается при импорте, геттер только читает имя модуля
+_global_container: DIContainer = DIContainer()
 
 
 def get_container() -> DIContainer:
@@ -184,11 +213,6 @@ def get_container() -> DIContainer:
     Returns:
         Экземпляр DIContainer
     """
-    global _global_container
-    
-    if _global_container is None:
-        _global_container = DIContainer()
-    
     return _global_container
 
 
@@ -203,4 +227,4 @@ def setup_dependencies():
 def reset_container():
     """Сброс контейнера (для тестов)."""
     global _global_container
-    _global_container = None
+    _global_container = DIContainer()
@@ -160,6 +160,9 @@ class ElasticsearchClient:
         try:
             response = await self._client.count(index=self._config.index_name)
             return response["count"]
+        except NotFoundError:
+            # Индекса нет — штатная ситуация, вызывающий код проверяет её через index_exists()
+            return None
         except Exception as e:
             logger.error(f"Ошибка получения количества документов: {e}")
             return None
@@ -1,16 +1,22 @@
 """Application lifecycle management."""
 
 import asyncio
+from contextlib import suppress
 from fastapi import FastAPI
 
+from src.core.config import settings
 from src.core.logging import get_logger
 from src.core.elasticsearch import ElasticsearchClient
 from src.core.metrics import get_metrics_collector, get_system_monitor
+from src.core.rate_limiter import get_rate_limiter
 from src.core.dependency_injection import setup_dependencies
 from src.core.startup import auto_index_on_startup
+from src.parsers.hbk_parser import shutdown_parse_pool
 from src.infrastructure.background.indexing_manager import setup_indexing_manager, get_indexing_manager
 
 logger = get_logger(__name__)
+_metrics = get_metrics_collector()
+_monitor = get_system_monitor()
 
 
 async def startup(app: FastAPI):
@@ -22,8 +28,14 @@ async def startup(app: FastAPI):
     """
     logger.info("Запуск MCP сервера синтаксис-помощника 1С")
     
-    metrics = get_metrics_collector()
-    monitor = get_system_monitor()
+    # Каждый процесс uvicorn выполняет свой lifespan: при нескольких процессах
+    # переиндексация удаляла бы и заполняла один индекс одновременно
+    multi_worker = settings.server.workers > 1
+    if multi_worker and settings.should_reindex_on_startup:
+        raise RuntimeError(
+            "Переиндексация при запуске несовместима с SERVER_WORKERS > 1: "
+            "выполните full_indexing.py перед запуском"
+        )
     
     # Настройка dependency injection
     setup_dependencies()
@@ -36,27 +48,38 @@ async def startup(app: FastAPI):
     app.state.indexing_manager = indexing_manager
     logger.info("Менеджер фоновой индексации инициализирован")
     
-    # Запуск мониторинга системы
-    await monitor.start_monitoring(interval=60)
-    
-    # Создаём и подключаемся к Elasticsearch
+    # Создаём единственный клиент Elasticsearch на всё время жизни приложения.
+    # Он сохраняется в app.state даже при неудачном подключении: пул соединений
+    # AsyncElasticsearch уже создан и переподключится при следующих запросах.
     es_client = ElasticsearchClient()
-    connected = await es_client.connect()
+    app.state.es_client = es_client
     
+    # Подключение к Elasticsearch не зависит от мониторинга системы и очистки
+    # rate limiter, поэтому они запускаются, пока идет подключение
+    connected, _, _ = await asyncio.gather(
+        es_client.connect(),
+        _monitor.start_monitoring(interval=60),
+        get_rate_limiter().start_cleanup()
+    )
+
     if not connected:
         logger.error("Не удалось подключиться к Elasticsearch")
-        await metrics.increment("startup.elasticsearch.connection_failed")
+        _metrics.increment("startup.elasticsearch.connection_failed")
     else:
         logger.info("Успешно подключились к Elasticsearch")
-        await metrics.increment("startup.elasticsearch.connection_success")
-        
-        # Сохраняем клиента в app.state
-        app.state.es_client = es_client
-        
-        # Проверяем наличие .hbk файла и запускаем фоновую автоиндексацию
-        await auto_index_on_startup(es_client)
+        _metrics.increment("startup.elasticsearch.connection_success")
+
+        if multi_worker:
+            logger.warning(
+                "Автоиндексация отключена при нескольких процессах: "
+                "индекс заполняется заранее через full_indexing.py"
+            )
+        else:
+            # Проверка индекса и автоиндексация выполняются в фоне и не
+            # задерживают готовность сервера; прогресс доступен в /index/status
+            app.state.auto_index_task = asyncio.create_task(auto_index_on_startup(es_client))
     
-    await metrics.increment("startup.completed")
+    _metrics.increment("startup.completed")
     logger.info("✅ Приложение запущено (индексация в фоне)")
 
 
@@ -70,8 +93,12 @@ async def shutdown(app: FastAPI):
     """
     logger.info("Остановка MCP сервера")
     
-    metrics = get_metrics_collector()
-    monitor = get_system_monitor()
+    # Отменяем автоиндексацию, если она еще не передала работу менеджеру
+    auto_index_task = getattr(app.state, 'auto_index_task', None)
+    if auto_index_task is not None and not auto_index_task.done():
+        auto_index_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await auto_index_task
     
     # Graceful shutdown для фоновой индексации
     if hasattr(app.state, 'indexing_manager'):
@@ -80,12 +107,16 @@ async def shutdown(app: FastAPI):
             logger.info("Обнаружена активная индексация, ожидание завершения...")
             await manager.graceful_shutdown(timeout=30)
     
+    # Останавливаем процесс парсинга .hbk
+    shutdown_parse_pool()
+    
     # Останавливаем мониторинг
-    await monitor.stop_monitoring()
+    await _monitor.stop_monitoring()
+    await get_rate_limiter().stop_cleanup()
     
     # Отключаемся от Elasticsearch
     if hasattr(app.state, 'es_client'):
         await app.state.es_client.disconnect()
     
-    await metrics.increment("shutdown.completed")
+    _metrics.increment("shutdown.completed")
     logger.info("✅ MCP сервер остановлен")
@@ -1,11 +1,16 @@
 """Система логирования."""
 
+import atexit
 import logging
-import json
+import queue
 import sys
-from datetime import datetime, timezone
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+import orjson
 
 from src.core.config import settings
 
@@ -16,7 +21,7 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Форматирует запись лога в JSON."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self.format_timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -26,18 +31,58 @@ class JSONFormatter(logging.Formatter):
         }
         
         # Добавляем исключение, если есть
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        exc_info = record.exc_info
+        if exc_info:
+            log_data["exception"] = self.formatException(exc_info)
         
         # Добавляем дополнительные поля
-        if hasattr(record, "extra_data"):
-            log_data.update(record.extra_data)
+        extra_data = getattr(record, "extra_data", None)
+        if extra_data:
+            log_data.update(extra_data)
             
-        return json.dumps(log_data, ensure_ascii=False)
+        # default=str: нестандартные значения в extra_data не роняют логирование
+        return orjson.dumps(log_data, default=str).decode()
+    
+    @staticmethod
+    def format_timestamp(record: logging.LogRecord) -> str:
+        """ISO 8601 время записи в UTC из record.created без создания datetime."""
+        return "%s.%03d+00:00" % (
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)),
+            record.msecs
+        )
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler, передающий запись в очередь почти без изменений.
+    
+    Стандартный prepare() форматирует запись и убирает exc_info, из-за чего
+    JSONFormatter потерял бы поле exception. Очередь внутрипроцессная, поэтому
+    достаточно зафиксировать сообщение, пока аргументы не изменились.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Фоновый поток, который пишет записи из очереди в обработчики
+_queue_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Останавливает фоновую запись логов, дописав оставшиеся записи."""
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
 
 
 def setup_logging() -> None:
     """Настраивает систему логирования."""
+    global _queue_listener
     
     # Создаем директорию для логов
     logs_dir = Path(settings.logs_directory)
@@ -48,6 +93,7 @@ def setup_logging() -> None:
     logger.setLevel(getattr(logging, settings.log_level.upper()))
     
     # Очищаем существующие обработчики
+    stop_logging()
     logger.handlers.clear()
     
     # Консольный обработчик
@@ -64,7 +110,6 @@ def setup_logging() -> None:
         console_formatter = JSONFormatter()
     
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # Файловый обработчик
     file_handler = logging.FileHandler(
@@ -73,7 +118,6 @@ def setup_logging() -> None:
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
     
     # Обработчик для ошибок
     error_handler = logging.FileHandler(
@@ -82,19 +126,37 @@ def setup_logging() -> None:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(JSONFormatter())
-    logger.addHandler(error_handler)
+    
+    # Event loop только кладет записи в очередь, запись в файлы и stdout
+    # выполняется в фоновом потоке
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_listener = QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+    logger.addHandler(_RecordQueueHandler(log_queue))
     
     # Настраиваем уровни для внешних библиотек
     logging.getLogger("elasticsearch").setLevel(logging.WARNING)
     logging.getLogger("elastic_transport").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("uvicorn.access").setLevel(logging.INFO)
+    # Строка access-лога на каждый запрос нужна только при разработке
+    logging.getLogger("uvicorn.access").setLevel(
+        logging.INFO if settings.debug else logging.WARNING
+    )
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Получает логгер с указанным именем."""
+    """Получает логгер с указанным именем (повторные вызовы без блокировки logging)."""
     return logging.getLogger(name)
 
 
 # Инициализируем логирование при импорте модуля
 setup_logging()
+atexit.register(stop_logging)
+
+# Уровень логирования задается один раз при старте: горячие пути проверяют
+# этот флаг вместо вызова logger.debug с созданием LogRecord
+DEBUG_ENABLED = logging.getLogger().isEnabledFor(logging.DEBUG)
@@ -4,13 +4,14 @@
 
 import time
 import asyncio
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Dict, Optional, Any
+from dataclasses import dataclass
 from collections import defaultdict, deque
 from contextlib import asynccontextmanager
 from enum import Enum
+from types import MappingProxyType
 import psutil
-from src.core.logging import get_logger
+from src.core.logging import get_logger, DEBUG_ENABLED
 
 logger = get_logger(__name__)
 
@@ -23,24 +24,117 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricValue:
     """Значение метрики."""
     value: float
     timestamp: float
-    labels: Dict[str, str] = field(default_factory=dict)
+    # None вместо пустого словаря: метки у большинства значений отсутствуют
+    labels: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceStats:
     """Статистика производительности."""
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    avg_response_time: float = 0.0
+    total_response_time: float = 0.0
     max_response_time: float = 0.0
     min_response_time: float = float('inf')
     current_active_requests: int = 0
+    
+    @property
+    def avg_response_time(self) -> float:
+        """Среднее время ответа, вычисляется по накопленной сумме."""
+        if not self.total_requests:
+            return 0.0
+        return self.total_response_time / self.total_requests
+
+
+class TimerStat:
+    """
+    Скользящая статистика таймера по последним значениям.
+    
+    Сумма ведется инкрементально, минимум и максимум — тоже, пока из окна
+    не вытеснено текущее экстремальное значение; тогда они пересчитываются
+    лениво при следующем чтении.
+    """
+    
+    __slots__ = ('values', 'total', '_min', '_max')
+    
+    def __init__(self, maxlen: int):
+        self.values: deque = deque(maxlen=maxlen)
+        self.total = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+    
+    def add(self, duration: float):
+        """Добавление значения с вытеснением самого старого."""
+        values = self.values
+        if len(values) == values.maxlen:
+            evicted = values[0]
+            self.total -= evicted
+            if evicted == self._min:
+                self._min = None
+            if evicted == self._max:
+                self._max = None
+        
+        values.append(duration)
+        self.total += duration
+        
+        if self._min is not None and duration < self._min:
+            self._min = duration
+        if self._max is not None and duration > self._max:
+            self._max = duration
+    
+    @property
+    def count(self) -> int:
+        return len(self.values)
+    
+    @property
+    def avg(self) -> float:
+        return self.total / len(self.values)
+    
+    @property
+    def min(self) -> float:
+        if self._min is None:
+            self._min = min(self.values)
+        return self._min
+    
+    @property
+    def max(self) -> float:
+        if self._max is None:
+            self._max = max(self.values)
+        return self._max
+    
+    @property
+    def last(self) -> float:
+        return self.values[-1]
+
+
+class _HistoryDict(dict):
+    """Словарь истории метрик: отсутствующий ключ получает deque(maxlen)."""
+    
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self._maxlen = maxlen
+    
+    def __missing__(self, name: str) -> deque:
+        history = self[name] = deque(maxlen=self._maxlen)
+        return history
+
+
+class _TimerDict(dict):
+    """Словарь таймеров: отсутствующий ключ получает TimerStat(maxlen)."""
+    
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self._maxlen = maxlen
+    
+    def __missing__(self, name: str) -> TimerStat:
+        timer = self[name] = TimerStat(self._maxlen)
+        return timer
 
 
 class MetricsCollector:
@@ -48,39 +142,49 @@ class MetricsCollector:
     
     def __init__(self, history_size: int = 1000):
         self.history_size = history_size
-        self._metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
+        self.clear()
+    
+    def clear(self):
+        """
+        Сброс всех накопленных метрик.
+        
+        Экземпляр сохраняется: модули, связавшие сборщик при импорте,
+        продолжают писать в него и видят сброс.
+        """
+        history_size = self.history_size
+        self._metrics: Dict[str, deque] = _HistoryDict(history_size)
         self._counters: Dict[str, float] = defaultdict(float)
         self._gauges: Dict[str, float] = defaultdict(float)
-        self._timers: Dict[str, List[float]] = defaultdict(list)
+        self._timers: Dict[str, TimerStat] = _TimerDict(history_size)
         
         # Статистика производительности
         self.performance_stats = PerformanceStats()
-        
-        # Блокировка для thread safety
-        self._lock = asyncio.Lock()
     
-    async def increment(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
         """
         Увеличение счетчика.
         
+        Синхронный метод без блокировки: обновление словаря и deque не
+        прерывается переключением задач event loop.
+        
         Args:
             name: Имя метрики
             value: Значение для увеличения
             labels: Метки
         """
-        async with self._lock:
-            self._counters[name] += value
-            
-            metric_value = MetricValue(
-                value=self._counters[name],
-                timestamp=time.time(),
-                labels=labels or {}
-            )
-            
-            self._metrics[name].append(metric_value)
-            logger.debug(f"Counter {name} incremented by {value}, total: {self._counters[name]}")
+        self._counters[name] += value
+        
+        metric_value = MetricValue(
+            value=self._counters[name],
+            timestamp=time.time(),
+            labels=labels
+        )
+        
+        self._metrics[name].append(metric_value)
+        if DEBUG_ENABLED:
+            logger.debug("Counter %s incremented by %s, total: %s", name, value, self._counters[name])
     
-    async def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """
         Установка значения gauge метрики.
         
@@ -89,42 +193,60 @@ class MetricsCollector:
             value: Значение
             labels: Метки
         """
-        async with self._lock:
-            self._gauges[name] = value
-            
-            metric_value = MetricValue(
-                value=value,
-                timestamp=time.time(),
-                labels=labels or {}
-            )
-            
-            self._metrics[name].append(metric_value)
-            logger.debug(f"Gauge {name} set to {value}")
+        self._gauges[name] = value
+        
+        metric_value = MetricValue(
+            value=value,
+            timestamp=time.time(),
+            labels=labels
+        )
+        
+        self._metrics[name].append(metric_value)
+        if DEBUG_ENABLED:
+            logger.debug("Gauge %s set to %s", name, value)
+    
+    def set_gauges(self, values: Dict[str, float]):
+        """
+        Установка значений нескольких gauge метрик с общей меткой времени.
+        
+        Args:
+            values: Словарь имя метрики -> значение
+        """
+        timestamp = time.time()
+        gauges = self._gauges
+        metrics = self._metrics
+        
+        for name, value in values.items():
+            gauges[name] = value
+            metrics[name].append(MetricValue(value=value, timestamp=timestamp))
+        
+        if DEBUG_ENABLED:
+            logger.debug("Gauges set: %d", len(values))
     
-    async def record_timer(self, name: str, duration: float, labels: Optional[Dict[str, str]] = None):
+    def record_timer(self, name: str, duration: float, labels: Optional[Dict[str, str]] = None):
         """
         Запись времени выполнения.
         
+        Синхронный метод: вызывается на каждый запрос, а операции над
+        deque не прерываются переключением задач event loop,
+        поэтому блокировка и await не нужны.
+        
         Args:
             name: Имя метрики
             duration: Продолжительность в секундах
             labels: Метки
         """
-        async with self._lock:
-            self._timers[name].append(duration)
-            
-            # Оставляем только последние значения
-            if len(self._timers[name]) > self.history_size:
-                self._timers[name] = self._timers[name][-self.history_size:]
-            
-            metric_value = MetricValue(
-                value=duration,
-                timestamp=time.time(),
-                labels=labels or {}
-            )
-            
-            self._metrics[name].append(metric_value)
-            logger.debug(f"Timer {name} recorded: {duration:.3f}s")
+        self._timers[name].add(duration)
+        
+        metric_value = MetricValue(
+            value=duration,
+            timestamp=time.time(),
+            labels=labels
+        )
+        
+        self._metrics[name].append(metric_value)
+        if DEBUG_ENABLED:
+            logger.debug("Timer %s recorded: %.3fs", name, duration)
     
     @asynccontextmanager
     async def timer(self, name: str, labels: Optional[Dict[str, str]] = None):
@@ -135,12 +257,14 @@ class MetricsCollector:
             name: Имя метрики
             labels: Метки
         """
-        start_time = time.time()
+        # Длительность меряем монотонными часами: time.time() может прыгать
+        # при коррекции системного времени
+        start_time = time.monotonic()
         try:
             yield
         finally:
-            duration = time.time() - start_time
-            await self.record_timer(name, duration, labels)
+            duration = time.monotonic() - start_time
+            self.record_timer(name, duration, labels)
     
     async def get_metric_stats(self, name: str) -> Dict[str, Any]:
         """
@@ -152,61 +276,78 @@ class MetricsCollector:
         Returns:
             Словарь со статистикой
         """
-        async with self._lock:
-            if name in self._counters:
-                return {
-                    'type': 'counter',
-                    'value': self._counters[name],
-                    'history_size': len(self._metrics[name])
-                }
-            
-            if name in self._gauges:
+        if name in self._counters:
+            return {
+                'type': 'counter',
+                'value': self._counters[name],
+                'history_size': len(self._metrics[name])
+            }
+        
+        if name in self._gauges:
+            return {
+                'type': 'gauge',
+                'value': self._gauges[name],
+                'history_size': len(self._metrics[name])
+            }
+        
+        if name in self._timers:
+            timer = self._timers[name]
+            if timer.count:
                 return {
-                    'type': 'gauge',
-                    'value': self._gauges[name],
-                    'history_size': len(self._metrics[name])
+                    'type': 'timer',
+                    'count': timer.count,
+                    'avg': timer.avg,
+                    'min': timer.min,
+                    'max': timer.max,
+                    'last': timer.last
                 }
-            
-            if name in self._timers:
-                timers = self._timers[name]
-                if timers:
-                    return {
-                        'type': 'timer',
-                        'count': len(timers),
-                        'avg': sum(timers) / len(timers),
-                        'min': min(timers),
-                        'max': max(timers),
-                        'last': timers[-1] if timers else 0
-                    }
-            
-            return {'type': 'unknown', 'value': None}
+        
+        return {'type': 'unknown', 'value': None}
+    
+    def _timer_stats(self) -> Dict[str, Dict[str, float]]:
+        """Сводная статистика по всем непустым таймерам."""
+        return {
+            name: {
+                'count': timer.count,
+                'avg': timer.avg,
+                'min': timer.min,
+                'max': timer.max
+            }
+            for name, timer in self._timers.items()
+            if timer.count
+        }
     
     async def get_all_metrics(self) -> Dict[str, Any]:
         """
         Получение всех метрик.
         
+        Счетчики и gauge возвращаются как представления только для чтения
+        без копирования; они отражают последующие изменения. Для сохранения
+        или сериализации используйте get_all_metrics_snapshot().
+        
         Returns:
             Словарь со всеми метриками
         """
-        async with self._lock:
-            result = {
-                'counters': dict(self._counters),
-                'gauges': dict(self._gauges),
-                'timers': {}
-            }
-            
-            for name, timers in self._timers.items():
-                if timers:
-                    result['timers'][name] = {
-                        'count': len(timers),
-                        'avg': sum(timers) / len(timers),
-                        'min': min(timers),
-                        'max': max(timers)
-                    }
-            
-            return result
+        return {
+            'counters': MappingProxyType(self._counters),
+            'gauges': MappingProxyType(self._gauges),
+            'timers': self._timer_stats()
+        }
     
-    async def update_performance_stats(self, success: bool, response_time: float):
+    async def get_all_metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Получение копии всех метрик на текущий момент.
+        
+        Returns:
+            Словарь со всеми метриками
+        """
+        return {
+            'counters': dict(self._counters),
+            'gauges': dict(self._gauges),
+            'timers': self._timer_stats()
+        }
+    
+    def update_performance_stats(self, success: bool, response_time: float):
         """
         Обновление статистики производительности.
         
@@ -214,34 +355,40 @@ class MetricsCollector:
             success: Успешный ли запрос
             response_time: Время ответа в секундах
         """
-        async with self._lock:
-            self.performance_stats.total_requests += 1
-            
-            if success:
-                self.performance_stats.successful_requests += 1
-            else:
-                self.performance_stats.failed_requests += 1
-            
-            # Обновляем статистику времени ответа
-            if response_time > self.performance_stats.max_response_time:
-                self.performance_stats.max_response_time = response_time
-            
-            if response_time < self.performance_stats.min_response_time:
-                self.performance_stats.min_response_time = response_time
-            
-            # Вычисляем среднее время ответа
-            total_time = (self.performance_stats.avg_response_time * 
-                         (self.performance_stats.total_requests - 1) + response_time)
-            self.performance_stats.avg_response_time = total_time / self.performance_stats.total_requests
+        stats = self.performance_stats
+        stats.total_requests += 1
+        
+        if success:
+            stats.successful_requests += 1
+        else:
+            stats.failed_requests += 1
+        
+        # Накапливаем сумму: среднее считается только при чтении
+        stats.total_response_time += response_time
+        
+        # Обновляем статистику времени ответа
+        max_time = stats.max_response_time
+        stats.max_response_time = max_time if response_time <= max_time else response_time
+        min_time = stats.min_response_time
+        stats.min_response_time = min_time if response_time >= min_time else response_time
 
 
 class SystemMonitor:
     """Монитор системных ресурсов."""
     
+    # Заполнение диска меняется медленно, опрашиваем его реже остальных метрик
+    DISK_CHECK_INTERVAL = 300
+    
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics = metrics_collector
         self._monitoring = False
         self._monitor_task: Optional[asyncio.Task] = None
+        
+        # Последние значения диска и сетевых счетчиков
+        self._disk_gauges: Dict[str, float] = {}
+        self._last_disk_check: Optional[float] = None
+        self._last_net: Optional[Any] = None
+        self._last_net_time: Optional[float] = None
     
     async def start_monitoring(self, interval: int = 30):
         """
@@ -255,6 +402,9 @@ class SystemMonitor:
             return
         
         self._monitoring = True
+        # Первый вызов cpu_percent() без интервала всегда возвращает 0.0:
+        # запускаем отсчет заранее, чтобы первый замер был осмысленным
+        psutil.cpu_percent()
         self._monitor_task = asyncio.create_task(self._monitor_loop(interval))
         logger.info(f"System monitoring started with {interval}s interval")
     
@@ -286,37 +436,60 @@ class SystemMonitor:
     async def _collect_system_metrics(self):
         """Сбор системных метрик."""
         try:
-            # CPU
-            cpu_percent = psutil.cpu_percent()
-            await self.metrics.set_gauge('system.cpu.usage_percent', cpu_percent)
-            
-            # Memory
-            memory = psutil.virtual_memory()
-            await self.metrics.set_gauge('system.memory.usage_percent', memory.percent)
-            await self.metrics.set_gauge('system.memory.used_mb', memory.used / 1024 / 1024)
-            await self.metrics.set_gauge('system.memory.available_mb', memory.available / 1024 / 1024)
-            
-            # Disk
-            disk = psutil.disk_usage('/')
-            await self.metrics.set_gauge('system.disk.usage_percent', 
-                                       (disk.used / disk.total) * 100)
-            await self.metrics.set_gauge('system.disk.free_gb', disk.free / 1024 / 1024 / 1024)
-            
-            # Network (if available)
-            try:
-                network = psutil.net_io_counters()
-                await self.metrics.set_gauge('system.network.bytes_sent', network.bytes_sent)
-                await self.metrics.set_gauge('system.network.bytes_recv', network.bytes_recv)
-            except Exception:
-                pass  # Network stats might not be available
+            # Системные вызовы psutil выполняются вне event loop
+            gauges = await asyncio.to_thread(self._read_system_metrics)
+            self.metrics.set_gauges(gauges)
             
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
+    
+    def _read_system_metrics(self) -> Dict[str, float]:
+        """Чтение системных метрик (блокирующее, вызывается в потоке)."""
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+        
+        gauges = {
+            # CPU
+            'system.cpu.usage_percent': psutil.cpu_percent(),
+            # Memory
+            'system.memory.usage_percent': memory.percent,
+            'system.memory.used_mb': memory.used / 1024 / 1024,
+            'system.memory.available_mb': memory.available / 1024 / 1024,
+        }
+        
+        # Disk
+        if self._last_disk_check is None or now - self._last_disk_check >= self.DISK_CHECK_INTERVAL:
+            disk = psutil.disk_usage('/')
+            self._disk_gauges = {
+                'system.disk.usage_percent': (disk.used / disk.total) * 100,
+                'system.disk.free_gb': disk.free / 1024 / 1024 / 1024,
+            }
+            self._last_disk_check = now
+        gauges.update(self._disk_gauges)
+        
+        # Network (if available): скорость обмена с момента прошлого замера
+        try:
+            network = psutil.net_io_counters()
+            if self._last_net is not None and now > self._last_net_time:
+                elapsed = now - self._last_net_time
+                gauges['system.network.bytes_sent_per_sec'] = (
+                    (network.bytes_sent - self._last_net.bytes_sent) / elapsed
+                )
+                gauges['system.network.bytes_recv_per_sec'] = (
+                    (network.bytes_recv - self._last_net.bytes_recv) / elapsed
+                )
+            self._last_net = network
+            self._last_net_time = now
+        except Exception:
+            pass  # Network stats might not be available
+        
+        return gauges
 
 
-# Глобальный экземпляр сборщика метрик
-_global_metrics: Optional[MetricsCollector] = None
-_global_monitor: Optional[SystemMonitor] = None
+# Глобальные экземпляры создаются при импорте: конструкторы только выделяют
+# память, а геттеры сводятся к чтению имени модуля
+_global_metrics: MetricsCollector = MetricsCollector()
+_global_monitor: SystemMonitor = SystemMonitor(_global_metrics)
 
 
 def get_metrics_collector() -> MetricsCollector:
@@ -326,11 +499,6 @@ def get_metrics_collector() -> MetricsCollector:
     Returns:
         Экземпляр MetricsCollector
     """
-    global _global_metrics
-    
-    if _global_metrics is None:
-        _global_metrics = MetricsCollector()
-    
     return _global_metrics
 
 
@@ -341,22 +509,13 @@ def get_system_monitor() -> SystemMonitor:
     Returns:
         Экземпляр SystemMonitor
     """
-    global _global_monitor, _global_metrics
-    
-    if _global_monitor is None:
-        if _global_metrics is None:
-            _global_metrics = MetricsCollector()
-        _global_monitor = SystemMonitor(_global_metrics)
-    
     return _global_monitor
 
 
 def reset_metrics():
     """Сброс глобальных метрик (для тестов)."""
-    global _global_metrics, _global_monitor
-    
-    if _global_monitor:
+    if _global_monitor._monitoring:
         asyncio.create_task(_global_monitor.stop_monitoring())
     
-    _global_metrics = None
-    _global_monitor = None
+    # Экземпляры не заменяются: middleware и роутеры связывают их при импорте
+    _global_metrics.clear()
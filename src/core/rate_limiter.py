@@ -2,10 +2,10 @@
 Модуль ограничения скорости запросов (Rate Limiting).
 """
 
-import time
 import asyncio
-from typing import Dict, Optional
-from collections import defaultdict, deque
+import math
+import time
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from src.core.constants import REQUESTS_PER_MINUTE, REQUESTS_PER_HOUR
 from src.core.logging import get_logger
@@ -20,6 +20,11 @@ class RateLimitConfig:
     requests_per_hour: int = REQUESTS_PER_HOUR
     enable_blocking: bool = True
     cleanup_interval: int = 300  # 5 минут
+    
+    def __post_init__(self):
+        # Скорость пополнения ведер делится на эти лимиты
+        if self.requests_per_minute <= 0 or self.requests_per_hour <= 0:
+            raise ValueError("Лимиты запросов в минуту и в час должны быть больше нуля")
 
 
 class RateLimitExceeded(Exception):
@@ -31,19 +36,30 @@ class RateLimitExceeded(Exception):
 
 
 class RateLimiter:
-    """Ограничитель скорости запросов."""
+    """
+    Ограничитель скорости запросов на основе token bucket.
+
+    Для каждого клиента хранятся два ведра (минутное и часовое) и время
+    последнего пополнения. Проверка — чистая арифметика без await, поэтому
+    в однопоточном event loop блокировка не нужна.
+    """
     
     def __init__(self, config: Optional[RateLimitConfig] = None):
         self.config = config or RateLimitConfig()
         
-        # Хранение временных меток запросов по IP
-        self._requests: Dict[str, deque] = defaultdict(deque)
-        self._last_cleanup = time.time()
+        # Скорость пополнения ведер (токенов в секунду)
+        self._minute_rate = self.config.requests_per_minute / 60
+        self._hour_rate = self.config.requests_per_hour / 3600
         
-        # Блокировка для thread safety
-        self._lock = asyncio.Lock()
+        # Любое ведро пополняется от нуля до полного за свое окно, поэтому через
+        # час простоя состояние клиента совпадает с начальным
+        self._refill_time = 3600.0
+        
+        # Состояние клиента: (токены минутного ведра, токены часового ведра, время пополнения)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._cleanup_task: Optional[asyncio.Task] = None
     
-    async def check_rate_limit(self, client_id: str) -> bool:
+    def check_rate_limit(self, client_id: str) -> bool:
         """
         Проверка лимита запросов для клиента.
         
@@ -56,82 +72,108 @@ class RateLimiter:
         Raises:
             RateLimitExceeded: При превышении лимита
         """
-        async with self._lock:
-            current_time = time.time()
-            
-            # Очистка старых записей
-            await self._cleanup_old_requests(current_time)
-            
-            client_requests = self._requests[client_id]
-            
-            # Проверка лимита за минуту
-            minute_ago = current_time - 60
-            minute_requests = sum(1 for req_time in client_requests if req_time > minute_ago)
-            
-            if minute_requests >= self.config.requests_per_minute:
-                retry_after = 60 - (current_time - max(
-                    req_time for req_time in client_requests if req_time > minute_ago
-                ))
-                
-                logger.warning(f"Rate limit exceeded for {client_id}: {minute_requests} requests per minute")
-                
-                if self.config.enable_blocking:
-                    raise RateLimitExceeded(
-                        f"Превышен лимит запросов: {minute_requests}/{self.config.requests_per_minute} в минуту",
-                        int(retry_after)
-                    )
-                
-                return False
+        current_time = time.monotonic()
+        config = self.config
+        rpm = config.requests_per_minute
+        rph = config.requests_per_hour
+        buckets = self._buckets
+        
+        bucket = buckets.get(client_id)
+        if bucket is None:
+            minute_tokens = float(rpm)
+            hour_tokens = float(rph)
+        else:
+            minute_tokens, hour_tokens, last_refill = bucket
+            elapsed = current_time - last_refill
+            minute_tokens = min(rpm, minute_tokens + elapsed * self._minute_rate)
+            hour_tokens = min(rph, hour_tokens + elapsed * self._hour_rate)
+        
+        # Проверка лимита за минуту
+        if minute_tokens < 1:
+            buckets[client_id] = (minute_tokens, hour_tokens, current_time)
+            logger.warning("Rate limit exceeded for %s: %s requests per minute", client_id, rpm)
             
-            # Проверка лимита за час
-            hour_ago = current_time - 3600
-            hour_requests = sum(1 for req_time in client_requests if req_time > hour_ago)
+            if config.enable_blocking:
+                raise RateLimitExceeded(
+                    f"Превышен лимит запросов: {rpm} в минуту",
+                    math.ceil((1 - minute_tokens) / self._minute_rate)
+                )
             
-            if hour_requests >= self.config.requests_per_hour:
-                retry_after = 3600 - (current_time - max(
-                    req_time for req_time in client_requests if req_time > hour_ago
-                ))
-                
-                logger.warning(f"Rate limit exceeded for {client_id}: {hour_requests} requests per hour")
-                
-                if self.config.enable_blocking:
-                    raise RateLimitExceeded(
-                        f"Превышен лимит запросов: {hour_requests}/{self.config.requests_per_hour} в час",
-                        int(retry_after)
-                    )
-                
-                return False
+            return False
+        
+        # Проверка лимита за час
+        if hour_tokens < 1:
+            buckets[client_id] = (minute_tokens, hour_tokens, current_time)
+            logger.warning("Rate limit exceeded for %s: %s requests per hour", client_id, rph)
             
-            # Записываем текущий запрос
-            client_requests.append(current_time)
+            if config.enable_blocking:
+                raise RateLimitExceeded(
+                    f"Превышен лимит запросов: {rph} в час",
+                    math.ceil((1 - hour_tokens) / self._hour_rate)
+                )
             
-            logger.debug(f"Rate limit check passed for {client_id}: {minute_requests+1}/{self.config.requests_per_minute} per minute")
-            return True
-    
-    async def _cleanup_old_requests(self, current_time: float):
-        """Очистка старых записей о запросах."""
-        if current_time - self._last_cleanup < self.config.cleanup_interval:
-            return
-        
-        hour_ago = current_time - 3600
-        clients_to_remove = []
+            return False
         
-        for client_id, requests in self._requests.items():
-            # Удаляем запросы старше часа
-            while requests and requests[0] < hour_ago:
-                requests.popleft()
-            
-            # Удаляем клиентов без активных запросов
-            if not requests:
-                clients_to_remove.append(client_id)
+        # Списываем токен за текущий запрос
+        buckets[client_id] = (minute_tokens - 1, hour_tokens - 1, current_time)
+        return True
+    
+    def _cleanup_idle_clients(self, current_time: float):
+        """Удаление клиентов, чьи ведра уже полностью пополнились."""
+        # Через _refill_time любое ведро гарантированно полное,
+        # и хранить состояние клиента больше не нужно
+        idle_before = current_time - self._refill_time
+        buckets = self._buckets
         
+        clients_to_remove = [
+            client_id for client_id, bucket in buckets.items()
+            if bucket[2] < idle_before
+        ]
         for client_id in clients_to_remove:
-            del self._requests[client_id]
-        
-        self._last_cleanup = current_time
+            del buckets[client_id]
         
         if clients_to_remove:
-            logger.debug(f"Cleaned up {len(clients_to_remove)} inactive clients from rate limiter")
+            logger.debug("Cleaned up %d inactive clients from rate limiter", len(clients_to_remove))
+    
+    async def start_cleanup(self):
+        """Запуск фоновой очистки неактивных клиентов."""
+        if self._cleanup_task is not None:
+            logger.warning("Rate limiter cleanup already started")
+            return
+        
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop(self.config.cleanup_interval))
+    
+    async def stop_cleanup(self):
+        """Остановка фоновой очистки."""
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+    
+    async def _cleanup_loop(self, interval: int):
+        """Периодическая очистка вне пути обработки запросов."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self._cleanup_idle_clients(time.monotonic())
+            except Exception as e:
+                logger.error("Error in rate limiter cleanup: %s", e)
+    
+    def _current_tokens(self, client_id: str) -> Tuple[float, float]:
+        """Текущее число токенов в ведрах клиента с учетом пополнения."""
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            return float(self.config.requests_per_minute), float(self.config.requests_per_hour)
+        
+        minute_tokens, hour_tokens, last_refill = bucket
+        elapsed = time.monotonic() - last_refill
+        return (
+            min(self.config.requests_per_minute, minute_tokens + elapsed * self._minute_rate),
+            min(self.config.requests_per_hour, hour_tokens + elapsed * self._hour_rate)
+        )
     
     def get_client_stats(self, client_id: str) -> Dict[str, int]:
         """
@@ -143,22 +185,17 @@ class RateLimiter:
         Returns:
             Словарь со статистикой
         """
-        current_time = time.time()
-        client_requests = self._requests.get(client_id, deque())
-        
-        minute_ago = current_time - 60
-        hour_ago = current_time - 3600
-        
-        minute_requests = sum(1 for req_time in client_requests if req_time > minute_ago)
-        hour_requests = sum(1 for req_time in client_requests if req_time > hour_ago)
+        minute_tokens, hour_tokens = self._current_tokens(client_id)
+        remaining_minute = int(minute_tokens)
+        remaining_hour = int(hour_tokens)
         
         return {
-            'requests_per_minute': minute_requests,
-            'requests_per_hour': hour_requests,
+            'requests_per_minute': self.config.requests_per_minute - remaining_minute,
+            'requests_per_hour': self.config.requests_per_hour - remaining_hour,
             'limit_per_minute': self.config.requests_per_minute,
             'limit_per_hour': self.config.requests_per_hour,
-            'remaining_minute': max(0, self.config.requests_per_minute - minute_requests),
-            'remaining_hour': max(0, self.config.requests_per_hour - hour_requests)
+            'remaining_minute': remaining_minute,
+            'remaining_hour': remaining_hour
         }
     
     def get_global_stats(self) -> Dict[str, int]:
@@ -169,8 +206,7 @@ class RateLimiter:
             Словарь с глобальной статистикой
         """
         return {
-            'active_clients': len(self._requests),
-            'total_requests_tracked': sum(len(requests) for requests in self._requests.values())
+            'active_clients': len(self._buckets)
         }
 
 
@@ -1,6 +1,8 @@
 """Startup logic для приложения."""
 
 import asyncio
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from src.core.config import settings
@@ -11,11 +13,18 @@ from src.infrastructure.background.indexing_manager import get_indexing_manager
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _hbk_file_path() -> str:
+    """Путь к единственному .hbk файлу (вычисляется один раз)."""
+    return os.fspath(Path(settings.data.hbk_directory) / "shcntx_ru.hbk")
+
+
 async def auto_index_on_startup(es_client: ElasticsearchClient):
     """
     Автоматическая индексация в фоновом режиме при запуске.
     
     Проверяет наличие .hbk файла и запускает фоновую индексацию.
+    Выполняется отдельной задачей, чтобы не задерживать запуск сервера.
     Поведение зависит от настроек:
     - force_reindex=True или reindex_on_startup=true: всегда индексирует
     - Иначе: индексирует только если индекс пуст или не существует
@@ -25,9 +34,9 @@ async def auto_index_on_startup(es_client: ElasticsearchClient):
     """
     try:
         # Определяем путь к единственному .hbk файлу
-        hbk_file = Path(settings.data.hbk_directory) / "shcntx_ru.hbk"
+        hbk_file = _hbk_file_path()
         
-        if not hbk_file.exists():
+        if not os.path.isfile(hbk_file):
             logger.warning(f"Файл .hbk не найден: {hbk_file}")
             return
         
@@ -47,7 +56,7 @@ async def auto_index_on_startup(es_client: ElasticsearchClient):
         
         # Запускаем фоновую индексацию с задержкой
         logger.info(f"Запланирована фоновая индексация файла: {hbk_file}")
-        asyncio.create_task(_delayed_background_indexing(str(hbk_file), es_client))
+        await _delayed_background_indexing(hbk_file, es_client)
         
     except Exception as e:
         logger.error(f"Ошибка при планировании автоиндексации: {e}")
@@ -87,15 +96,14 @@ async def index_hbk_file(file_path: str, es_client: ElasticsearchClient) -> bool
         bool: True если индексация успешна, False иначе
     """
     try:
-        from src.parsers.hbk_parser import HBKParser
+        from src.parsers.hbk_parser import parse_file_in_process
         from src.parsers.indexer import ElasticsearchIndexer
         
         logger.info(f"Начинаем синхронную индексацию файла: {file_path}")
         
-        # Парсим .hbk файл в отдельном потоке (не блокируем event loop)
-        parser = HBKParser()
-        logger.info("Запускаем парсинг HBK файла в отдельном потоке...")
-        parsed_hbk = await asyncio.to_thread(parser.parse_file, file_path)
+        # Парсим .hbk файл в отдельном процессе (не блокируем event loop)
+        logger.info("Запускаем парсинг HBK файла в отдельном процессе...")
+        parsed_hbk = await parse_file_in_process(file_path)
         logger.info("Парсинг HBK файла завершен")
         
         if not parsed_hbk:
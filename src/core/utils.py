@@ -2,11 +2,13 @@
 Безопасные утилиты для системных операций.
 """
 
+import re
 import subprocess
 import shlex
 import tempfile
 import os
 import shutil
+import stat
 from pathlib import Path
 from typing import List, Optional, Tuple
 import logging
@@ -14,6 +16,12 @@ from .constants import EXTRACTION_TIMEOUT_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Разрешенные исполняемые файлы (проверяются по окончанию пути)
+_ALLOWED_EXEC_SUFFIXES = ("7z", "7z.exe", "unzip", "unzip.exe")
+
+# Метасимволы оболочки, недопустимые в аргументах
+_SHELL_META_RE = re.compile(r'[;&|`$()<>]')
+
 
 class SafeSubprocessError(Exception):
     """Исключение для ошибок безопасного subprocess."""
@@ -46,14 +54,13 @@ def safe_subprocess_run(
     
     # Проверка безопасности команды
     executable = command[0]
-    allowed_executables = {"7z", "7z.exe", "unzip", "unzip.exe"}
     
-    if not any(executable.endswith(allowed) for allowed in allowed_executables):
+    if not executable.endswith(_ALLOWED_EXEC_SUFFIXES):
         raise SafeSubprocessError(f"Недопустимая команда: {executable}")
     
     # Проверка аргументов на инъекции
     for arg in command[1:]:
-        if any(char in arg for char in [";", "&", "|", "`", "$", "(", ")", "<", ">"]):
+        if _SHELL_META_RE.search(arg):
             raise SafeSubprocessError(f"Подозрительный аргумент: {arg}")
     
     try:
@@ -112,6 +119,30 @@ def safe_remove_dir(path: Path) -> None:
         logger.warning(f"Ошибка удаления директории {path}: {e}")
 
 
+def find_first_file(directory: Path, suffix: str) -> Optional[Path]:
+    """
+    Поиск первого файла с указанным расширением в директории.
+    
+    В отличие от Path.glob, останавливается на первом совпадении и
+    использует кэшированный тип записи DirEntry без лишних stat.
+    
+    Args:
+        directory: Директория для поиска
+        suffix: Окончание имени файла (например, ".hbk")
+        
+    Returns:
+        Путь к файлу или None, если файл не найден
+        
+    Raises:
+        FileNotFoundError: Если директория не существует
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                return Path(entry.path)
+    return None
+
+
 def validate_file_path(file_path: Path, allowed_extensions: Optional[List[str]] = None) -> bool:
     """
     Валидация пути к файлу.
@@ -126,18 +157,18 @@ def validate_file_path(file_path: Path, allowed_extensions: Optional[List[str]]
     Raises:
         SafeSubprocessError: При невалидном пути
     """
-    if not file_path.exists():
+    # Один stat вместо exists/is_file/resolve: stat следует по символическим
+    # ссылкам и так же падает на битых ссылках и циклах
+    try:
+        file_stat = file_path.stat()
+    except FileNotFoundError:
         raise SafeSubprocessError(f"Файл не существует: {file_path}")
+    except OSError:
+        raise SafeSubprocessError(f"Невалидный путь: {file_path}")
     
-    if not file_path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         raise SafeSubprocessError(f"Путь не является файлом: {file_path}")
     
-    # Проверка на path traversal
-    try:
-        file_path.resolve(strict=True)
-    except Exception:
-        raise SafeSubprocessError(f"Невалидный путь: {file_path}")
-    
     if allowed_extensions:
         if file_path.suffix.lower() not in allowed_extensions:
             raise SafeSubprocessError(
@@ -2,10 +2,11 @@
 Модуль валидации входных данных.
 """
 
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
 import re
-from pydantic import BaseModel, validator, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from src.core.constants import (
     MAX_SEARCH_RESULTS, 
     SEARCH_TIMEOUT_SECONDS, 
@@ -14,6 +15,37 @@ from src.core.constants import (
 )
 
 
+# Регулярные выражения компилируются один раз при импорте модуля
+_HOST_RE = re.compile(
+    r'^(?:(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)*[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?|'
+    r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)|'
+    r'localhost)$'
+)
+_INDEX_NAME_RE = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+# Управляющие символы, которые JSON записывает escape-последовательностью
+_JSON_CONTROL_RE = re.compile(r'[\x00-\x1f]')
+
+# Таблица удаления запрещенных в поисковом запросе символов: если после
+# str.translate строка изменилась, значит такие символы в ней были
+_FORBIDDEN_QUERY_CHARS = str.maketrans('', '', '<>{}\\;&|')
+
+# Таблица удаления управляющих символов для str.translate (кроме \t, \n, \r)
+_CTRL_TRANS = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+
+def _is_valid_host(host: str) -> bool:
+    """Проверка формата хоста: домен, IPv4 или localhost."""
+    # Частые случаи проверяются строковыми методами без запуска regex
+    if host == 'localhost':
+        return True
+    
+    parts = host.split('.')
+    if len(parts) == 4 and all(p.isascii() and p.isdigit() and int(p) <= 255 for p in parts):
+        return True
+    
+    return _HOST_RE.match(host) is not None
+
+
 class ValidationError(Exception):
     """Исключение для ошибок валидации."""
     pass
@@ -22,6 +54,9 @@ class ValidationError(Exception):
 class SearchRequest(BaseModel):
     """Модель для валидации поискового запроса."""
     
+    # Обрезка пробелов и запрет лишних полей выполняются в pydantic-core
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+    
     query: str = Field(..., min_length=1, max_length=1000, description="Поисковый запрос")
     limit: int = Field(default=20, ge=1, le=MAX_SEARCH_RESULTS, description="Максимальное количество результатов")
     offset: int = Field(default=0, ge=0, description="Смещение для пагинации")
@@ -29,21 +64,21 @@ class SearchRequest(BaseModel):
     min_score: float = Field(default=MIN_SCORE_THRESHOLD, ge=0.0, le=1.0, description="Минимальный скор для результатов")
     categories: Optional[List[str]] = Field(default=None, description="Фильтр по категориям")
     
-    @validator('query')
-    def validate_query(cls, v):
+    @field_validator('query')
+    @classmethod
+    def validate_query(cls, v: str) -> str:
         """Валидация поискового запроса."""
-        if not v or not v.strip():
-            raise ValueError("Поисковый запрос не может быть пустым")
+        # Пробелы уже обрезаны, пустая строка отклонена через min_length
         
         # Проверка на подозрительные символы
-        dangerous_chars = ['<', '>', '{', '}', '\\', ';', '&', '|']
-        if any(char in v for char in dangerous_chars):
+        if v.translate(_FORBIDDEN_QUERY_CHARS) != v:
             raise ValueError("Поисковый запрос содержит недопустимые символы")
         
-        return v.strip()
+        return v
     
-    @validator('categories')
-    def validate_categories(cls, v):
+    @field_validator('categories')
+    @classmethod
+    def validate_categories(cls, v: Optional[List[str]]) -> Optional[List[str]]:
         """Валидация категорий."""
         if v is not None:
             if len(v) > 50:  # Не более 50 категорий
@@ -63,8 +98,9 @@ class IndexRequest(BaseModel):
     force_reindex: bool = Field(default=False, description="Принудительная переиндексация")
     batch_size: int = Field(default=100, ge=1, le=1000, description="Размер батча для индексации")
     
-    @validator('file_path')
-    def validate_file_path(cls, v):
+    @field_validator('file_path')
+    @classmethod
+    def validate_file_path(cls, v: Optional[str]) -> Optional[str]:
         """Валидация пути к файлу."""
         if v is not None:
             path = Path(v)
@@ -81,12 +117,17 @@ class IndexRequest(BaseModel):
         return v
 
 
-class HealthRequest(BaseModel):
+@dataclass(slots=True)
+class HealthRequest:
     """Модель для валидации запроса проверки здоровья."""
     
-    check_elasticsearch: bool = Field(default=True, description="Проверять ли Elasticsearch")
-    check_disk_space: bool = Field(default=True, description="Проверять ли дисковое пространство")
-    timeout: int = Field(default=10, ge=1, le=60, description="Таймаут проверки")
+    check_elasticsearch: bool = True  # Проверять ли Elasticsearch
+    check_disk_space: bool = True  # Проверять ли дисковое пространство
+    timeout: int = 10  # Таймаут проверки
+    
+    def __post_init__(self):
+        if not 1 <= self.timeout <= 60:
+            raise ValidationError("Таймаут проверки должен быть от 1 до 60 секунд")
 
 
 def validate_elasticsearch_config(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -114,13 +155,7 @@ def validate_elasticsearch_config(config: Dict[str, Any]) -> Dict[str, Any]:
         raise ValidationError("Host должен быть непустой строкой")
     
     # Простая валидация хоста (домен или IP)
-    host_pattern = re.compile(
-        r'^(?:(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)*[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?|'
-        r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)|'
-        r'localhost)$'
-    )
-    
-    if not host_pattern.match(host):
+    if not _is_valid_host(host):
         raise ValidationError("Недопустимый формат хоста")
     
     # Валидация порта
@@ -134,8 +169,7 @@ def validate_elasticsearch_config(config: Dict[str, Any]) -> Dict[str, Any]:
         raise ValidationError("Имя индекса должно быть непустой строкой")
     
     # Имя индекса должно соответствовать правилам Elasticsearch
-    index_pattern = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
-    if not index_pattern.match(index_name.lower()):
+    if not _INDEX_NAME_RE.match(index_name.lower()):
         raise ValidationError("Недопустимое имя индекса Elasticsearch")
     
     return {
@@ -161,10 +195,12 @@ def validate_file_size(file_path: Path, max_size_mb: int = MAX_REQUEST_SIZE_MB)
     Raises:
         ValidationError: При превышении размера
     """
-    if not file_path.exists():
+    try:
+        file_size = file_path.stat().st_size
+    except FileNotFoundError:
         raise ValidationError(f"Файл не существует: {file_path}")
     
-    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+    file_size_mb = file_size / (1024 * 1024)
     
     if file_size_mb > max_size_mb:
         raise ValidationError(
@@ -175,6 +211,58 @@ def validate_file_size(file_path: Path, max_size_mb: int = MAX_REQUEST_SIZE_MB)
     return True
 
 
+def _json_size_exceeds(obj: Any, limit: int) -> bool:
+    """
+    Проверка, превышает ли размер объекта в компактном JSON limit байт.
+    
+    Для строк, целых чисел, литералов и разделителей оценка совпадает с длиной
+    orjson.dumps. Дробные числа считаются по repr, а управляющие символы
+    в строках — по худшему случаю (\\u00XX), поэтому оценка не бывает меньше
+    реального размера. Обход прекращается, как только накопленная оценка
+    превысила лимит.
+    """
+    size = 0
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    
+    while stack:
+        item = pop()
+        if isinstance(item, str):
+            # Для ASCII-строк длина в байтах равна длине строки
+            size += (len(item) if item.isascii() else len(item.encode('utf-8'))) + 2
+            # Кавычки и обратные слэши экранируются одним символом
+            size += item.count('"') + item.count('\\')
+            if not item.isprintable():
+                size += 5 * len(_JSON_CONTROL_RE.findall(item))
+        elif item is None or item is True:
+            size += 4
+        elif item is False:
+            size += 5
+        elif isinstance(item, (int, float)):
+            size += len(repr(item))
+        elif isinstance(item, dict):
+            # Скобки, двоеточие на каждую пару и запятые между парами
+            size += 2 * len(item) + 1 if item else 2
+            # Огромный контейнер отсекается до копирования элементов в стек
+            if size > limit:
+                return True
+            extend(item.keys())
+            extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += len(item) + 1 if item else 2
+            if size > limit:
+                return True
+            extend(item)
+        else:
+            size += len(str(item)) + 2
+        
+        if size > limit:
+            return True
+    
+    return False
+
+
 def validate_json_payload(payload: Any, max_size_mb: int = 1) -> Dict[str, Any]:
     """
     Валидация JSON payload.
@@ -195,15 +283,10 @@ def validate_json_payload(payload: Any, max_size_mb: int = 1) -> Dict[str, Any]:
     if not isinstance(payload, dict):
         raise ValidationError("Payload должен быть объектом")
     
-    # Приблизительная оценка размера
-    import json
-    payload_size = len(json.dumps(payload, ensure_ascii=False))
-    max_size_bytes = max_size_mb * 1024 * 1024
-    
-    if payload_size > max_size_bytes:
+    # Приблизительная оценка размера с ранним прекращением обхода
+    if _json_size_exceeds(payload, max_size_mb * 1024 * 1024):
         raise ValidationError(
-            f"Payload слишком большой: {payload_size / 1024 / 1024:.1f}MB. "
-            f"Максимальный размер: {max_size_mb}MB"
+            f"Payload слишком большой. Максимальный размер: {max_size_mb}MB"
         )
     
     return payload
@@ -224,7 +307,7 @@ def sanitize_string(value: str, max_length: int = 1000) -> str:
         value = str(value)
     
     # Удаляем управляющие символы
-    value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', value)
+    value = value.translate(_CTRL_TRANS)
     
     # Ограничиваем длину
     if len(value) > max_length:
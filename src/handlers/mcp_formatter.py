@@ -1,8 +1,73 @@
 """Форматтер ответов MCP."""
 
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Any
 from src.models.mcp_models import MCPResponse
 
+# Шаблоны коротких сообщений, общие для всех запросов
+_NOT_FOUND_TMPL = "По запросу '{query}' ничего не найдено."
+_NOT_FOUND_CTX_TMPL = "По запросу '{query}' в контексте '{context}' ничего не найдено."
+_HEADER_TMPL = "📋 **Найдено:** {count} элементов по запросу \"{query}\"\n"
+
+# Заголовки разделов списка элементов объекта
+_OBJECT_HEADER_TMPL = "📦 **ОБЪЕКТ:** {}\n\n"
+_METHODS_HEADER_TMPL = "🔨 **Методы ({}):**\n"
+_PROPERTIES_HEADER_TMPL = "📋 **Свойства ({}):**\n"
+_EVENTS_HEADER_TMPL = "⚡ **События ({}):**\n"
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Обрезает текст до limit символов, добавляя многоточие."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@lru_cache(maxsize=256)
+def _not_found_text(query: str, context: str) -> str:
+    """Текст ответа «ничего не найдено» (повторные промахи берутся из кэша)."""
+    if context:
+        return _NOT_FOUND_CTX_TMPL.format(query=query, context=context)
+    return _NOT_FOUND_TMPL.format(query=query)
+
+
+def _text_block(text: str) -> Dict[str, str]:
+    """Текстовый блок содержимого ответа MCP."""
+    return {"type": "text", "text": text}
+
+
+# Содержимое ответов собирается форматтером из строк заведомо верной формы,
+# поэтому модель создается без повторной валидации полей
+_construct_response = MCPResponse.model_construct
+
+
+def _search_result_text(result: Dict[str, Any], index: int) -> str:
+    """Текст отдельного результата поиска."""
+    get = result.get
+    name = get("name", "")
+    obj = get("object", "")
+    description = get("description", "")
+    
+    parts = [f"{index}. **{name}**"]
+    if obj:
+        parts.append(f" ({obj} → Метод)" if obj != "Global context" else " (Глобальная функция)")
+    
+    if description:
+        desc = _truncate(description, 100)
+        parts.append(f"\n   └ {desc}")
+    
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _parameter_line(param: Dict[str, Any]) -> str:
+    """Строка описания параметра для технической справки."""
+    get = param.get
+    required = " (обязательный)" if get('required') else " (необязательный)"
+    description = get('description')
+    ending = f" - {description}\n" if description else "\n"
+    return f"   • {get('name', '')} ({get('type', '')}){required}{ending}"
+
 
 class MCPResponseFormatter:
     """Класс для стандартизированного форматирования ответов MCP."""
@@ -13,88 +78,63 @@ class MCPResponseFormatter:
         error_text = message
         if details:
             error_text += f": {details}"
-        return MCPResponse(content=[], error=error_text)
+        return _construct_response(content=[], error=error_text)
     
     @staticmethod
     def create_not_found_response(query: str, context: str = "") -> MCPResponse:
         """Создаёт стандартизированный ответ для случая 'не найдено'."""
-        if context:
-            text = f"По запросу '{query}' в контексте '{context}' ничего не найдено."
-        else:
-            text = f"По запросу '{query}' ничего не найдено."
-        
-        return MCPResponse(content=[{"type": "text", "text": text}])
+        # Кэшируется только текст: модель ответа изменяемая и не разделяется
+        return _construct_response(content=[_text_block(_not_found_text(query, context))], error=None)
     
     @staticmethod
     def create_success_response(content: List[Dict[str, str]]) -> MCPResponse:
         """Создаёт стандартизированный успешный ответ."""
-        return MCPResponse(content=content)
+        return _construct_response(content=content, error=None)
     
     @staticmethod
-    def format_search_header(count: int, query: str) -> Dict[str, str]:
-        """Форматирует заголовок результатов поиска."""
-        return {
-            "type": "text",
-            "text": f"📋 **Найдено:** {count} элементов по запросу \"{query}\"\n"
-        }
-    
-    @staticmethod
-    def format_search_result(result: Dict[str, Any], index: int) -> Dict[str, str]:
-        """Форматирует отдельный результат поиска."""
-        name = result.get("name", "")
-        obj = result.get("object", "")
-        description = result.get("description", "")
-        
-        text = f"{index}. **{name}**"
-        if obj:
-            text += f" ({obj} → Метод)" if obj != "Global context" else " (Глобальная функция)"
-        
-        if description:
-            desc = description[:100] + "..." if len(description) > 100 else description
-            text += f"\n   └ {desc}"
-        
-        return {"type": "text", "text": text + "\n"}
+    def format_search_results(search_results: List[Dict[str, Any]], query: str) -> Dict[str, str]:
+        """Форматирует заголовок и все результаты поиска одним текстовым блоком."""
+        parts = [_HEADER_TMPL.format(count=len(search_results), query=query)]
+        parts.extend(_search_result_text(result, i) for i, result in enumerate(search_results, 1))
+        return _text_block("".join(parts))
     
     @staticmethod
     def format_syntax_info(result: Dict[str, Any]) -> str:
         """Форматирует техническую справку."""
-        text = f"🔧 **ТЕХНИЧЕСКАЯ СПРАВКА:** {result.get('name', '')}"
+        # Фрагменты собираются в список и склеиваются один раз
+        get = result.get
+        parts = [f"🔧 **ТЕХНИЧЕСКАЯ СПРАВКА:** {get('name', '')}"]
+        append = parts.append
         
-        if result.get('object'):
-            text += f" ({result['object']})"
+        if obj := get('object'):
+            append(f" ({obj})")
         
-        text += "\n\n"
+        append("\n\n")
         
-        if result.get('description'):
-            text += f"📝 **Описание:**\n   {result['description']}\n\n"
+        if description := get('description'):
+            append(f"📝 **Описание:**\n   {description}\n\n")
         
-        if result.get('syntax_ru'):
-            text += f"🔤 **Синтаксис:**\n   `{result['syntax_ru']}`\n\n"
+        if syntax := get('syntax_ru'):
+            append(f"🔤 **Синтаксис:**\n   `{syntax}`\n\n")
         
-        # Параметры
-        parameters = result.get('parameters')
-        if parameters and isinstance(parameters, list):
-            text += "⚙️ **Параметры:**\n"
-            for param in parameters:
-                if isinstance(param, dict):
-                    required = " (обязательный)" if param.get('required') else " (необязательный)"
-                    text += f"   • {param.get('name', '')} ({param.get('type', '')}){required}"
-                    if param.get('description'):
-                        text += f" - {param['description']}"
-                    text += "\n"
-            text += "\n"
+        # Параметры (SearchService отдает их списком словарей)
+        if parameters := get('parameters'):
+            append("⚙️ **Параметры:**\n")
+            parts.extend(map(_parameter_line, parameters))
+            append("\n")
         
-        if result.get('return_type'):
-            text += f"↩️ **Возвращает:** {result['return_type']}\n\n"
+        if return_type := get('return_type'):
+            append(f"↩️ **Возвращает:** {return_type}\n\n")
         
-        return text
+        return "".join(parts)
     
     @staticmethod
     def format_quick_reference(result: Dict[str, Any]) -> str:
         """Форматирует краткую справку."""
-        name = result.get('name', '')
-        syntax = result.get('syntax_ru', '')
-        description = result.get('description', '')
+        get = result.get
+        name = get('name', '')
+        syntax = get('syntax_ru', '')
+        description = get('description', '')
         
         text = "⚡ **КРАТКАЯ СПРАВКА**\n\n"
         
@@ -105,8 +145,9 @@ class MCPResponseFormatter:
         
         if description:
             # Берем только первое предложение
-            desc = description.split('.')[0] + '.' if '.' in description else description
-            desc = desc[:100] + "..." if len(desc) > 100 else desc
+            head, sep, _ = description.partition('.')
+            desc = head + sep if sep else description
+            desc = _truncate(desc, 100)
             text += f"└ {desc}"
         
         return text
@@ -119,118 +160,101 @@ class MCPResponseFormatter:
     ) -> str:
         """Форматирует результаты контекстного поиска."""
         if context == "object":
-            objects = {}
+            objects = defaultdict(list)
             for result in search_results:
-                obj = result.get("object", "Неизвестно")
-                if obj not in objects:
-                    objects[obj] = []
-                objects[obj].append(result)
+                objects[result.get("object", "Неизвестно")].append(result)
             
-            text = f"🎯 **ПОИСК В КОНТЕКСТЕ:** {context}\n\n"
-            text += f"Найдено {len(search_results)} элементов по запросу \"{query}\"\n\n"
+            parts = [
+                f"🎯 **ПОИСК В КОНТЕКСТЕ:** {context}\n\n",
+                f"Найдено {len(search_results)} элементов по запросу \"{query}\"\n\n"
+            ]
+            append = parts.append
             
-            for obj, items in list(objects.items())[:5]:  # Максимум 5 объектов
-                text += f"📦 **{obj}:**\n"
+            for obj, items in islice(objects.items(), 5):  # Максимум 5 объектов
+                append(f"📦 **{obj}:**\n")
                 for item in items[:3]:  # Максимум 3 элемента на объект
                     name = item.get("name", "")
                     syntax = item.get("syntax_ru", "")
                     desc = item.get("description", "")
                     
-                    text += f"   • {name}"
+                    append(f"   • {name}")
                     if syntax:
-                        text += f" - `{syntax}`"
+                        append(f" - `{syntax}`")
                     if desc:
-                        short_desc = desc[:50] + "..." if len(desc) > 50 else desc
-                        text += f"\n     {short_desc}"
-                    text += "\n"
-                text += "\n"
+                        short_desc = _truncate(desc, 50)
+                        append(f"\n     {short_desc}")
+                    append("\n")
+                append("\n")
         else:
-            text = f"🔍 **ПОИСК В КОНТЕКСТЕ:** {context}\n\n"
-            text += f"Найдено {len(search_results)} элементов\n\n"
+            parts = [
+                f"🔍 **ПОИСК В КОНТЕКСТЕ:** {context}\n\n",
+                f"Найдено {len(search_results)} элементов\n\n"
+            ]
+            append = parts.append
             
             for i, result in enumerate(search_results[:8], 1):
                 name = result.get("name", "")
                 syntax = result.get("syntax_ru", "")
-                text += f"{i}. **{name}**"
+                append(f"{i}. **{name}**")
                 if syntax:
-                    text += f" - `{syntax}`"
-                text += "\n"
+                    append(f" - `{syntax}`")
+                append("\n")
         
-        return text
+        return "".join(parts)
     
-    @staticmethod
-    def format_quick_reference(result: dict) -> str:
-        """Форматирует краткую справку."""
-        name = result.get('name', '')
-        syntax = result.get('syntax_ru', '')
-        description = result.get('description', '')
-        
-        text = "⚡ **КРАТКАЯ СПРАВКА**\n\n"
-        
-        if syntax:
-            text += f"`{syntax}`\n"
-        else:
-            text += f"`{name}`\n"
-        
-        if description:
-            # Берем только первое предложение
-            desc = description.split('.')[0] + '.' if '.' in description else description
-            desc = desc[:100] + "..." if len(desc) > 100 else desc
-            text += f"└ {desc}"
-        
-        return text
-
     @staticmethod
     def format_object_members_list(object_name: str, member_type: str, methods: list, 
                                  properties: list, events: list, total: int) -> str:
         """Форматирует список элементов объекта."""
-        text = f"📦 **ОБЪЕКТ:** {object_name}\n\n"
+        parts = [_OBJECT_HEADER_TMPL.format(object_name)]
+        append = parts.append
         
         # Методы
         if member_type in ["all", "methods"] and methods:
-            text += f"🔨 **Методы ({len(methods)}):**\n"
+            append(_METHODS_HEADER_TMPL.format(len(methods)))
             for method in methods[:20]:  # Максимум 20
-                name = method.get("name", "")
-                syntax = method.get("syntax_ru", "")
-                desc = method.get("description", "")
+                method_get = method.get
+                name = method_get("name", "")
+                syntax = method_get("syntax_ru", "")
+                desc = method_get("description", "")
                 
-                text += f"   • **{name}**"
+                append(f"   • **{name}**")
                 if syntax:
-                    text += f" - `{syntax}`"
+                    append(f" - `{syntax}`")
                 if desc:
-                    short_desc = desc[:80] + "..." if len(desc) > 80 else desc
-                    text += f"\n     {short_desc}"
-                text += "\n"
-            text += "\n"
+                    short_desc = _truncate(desc, 80)
+                    append(f"\n     {short_desc}")
+                append("\n")
+            append("\n")
         
         # Свойства
         if member_type in ["all", "properties"] and properties:
-            text += f"📋 **Свойства ({len(properties)}):**\n"
+            append(_PROPERTIES_HEADER_TMPL.format(len(properties)))
             for prop in properties[:15]:  # Максимум 15
                 name = prop.get("name", "")
                 desc = prop.get("description", "")
                 
-                text += f"   • **{name}**"
+                append(f"   • **{name}**")
                 if desc:
-                    short_desc = desc[:60] + "..." if len(desc) > 60 else desc
-                    text += f" - {short_desc}"
-                text += "\n"
-            text += "\n"
+                    short_desc = _truncate(desc, 60)
+                    append(f" - {short_desc}")
+                append("\n")
+            append("\n")
         
         # События
         if member_type in ["all", "events"] and events:
-            text += f"⚡ **События ({len(events)}):**\n"
+            append(_EVENTS_HEADER_TMPL.format(len(events)))
             for event in events[:10]:  # Максимум 10
                 name = event.get("name", "")
                 desc = event.get("description", "")
                 
-                text += f"   • **{name}**"
+                append(f"   • **{name}**")
                 if desc:
-                    short_desc = desc[:60] + "..." if len(desc) > 60 else desc
-                    text += f" - {short_desc}"
-                text += "\n"
+                    short_desc = _truncate(desc, 60)
+                    append(f" - {short_desc}")
+                append("\n")
         
-        return text
+        return "".join(parts)
 
 
 # Глобальный экземпляр форматтера
@@ -1,5 +1,7 @@
 """Обработчики MCP запросов."""
 
+from typing import Optional
+
 from src.models.mcp_models import (
     MCPResponse, Find1CHelpRequest, GetSyntaxInfoRequest, GetQuickReferenceRequest,
     SearchByContextRequest, ListObjectMembersRequest
@@ -7,22 +9,43 @@ from src.models.mcp_models import (
 from src.core.elasticsearch import ElasticsearchClient
 from src.search.search_service import SearchService
 from src.handlers.mcp_formatter import mcp_formatter
-from src.core.logging import get_logger
+from src.core.logging import get_logger, DEBUG_ENABLED
 
 logger = get_logger(__name__)
 
+# Название контекста поиска для сообщения «ничего не найдено»
+_CONTEXT_NAMES = {"global": "глобальном", "object": "объектном", "all": "любом"}
+
+# SearchService не хранит состояния запроса: один экземпляр обслуживает
+# все запросы, пока приложение использует тот же клиент Elasticsearch
+_search_service: Optional[SearchService] = None
+
+
+def _get_search_service(es_client: ElasticsearchClient) -> SearchService:
+    """Возвращает сервис поиска для клиента, создавая его при смене клиента."""
+    global _search_service
+    
+    if _search_service is None or _search_service.es_client is not es_client:
+        _search_service = SearchService(es_client)
+    
+    return _search_service
+
 
 def _log_mcp_request(tool_name: str, **context):
     """Логирует MCP запрос с контекстом."""
-    logger.debug(f"MCP запрос: {tool_name}", extra={"extra_data": {"tool": tool_name, **context}})
+    if not DEBUG_ENABLED:
+        return
+    logger.debug("MCP запрос: %s", tool_name, extra={"extra_data": {"tool": tool_name, **context}})
 
 
 def _log_mcp_success(tool_name: str, count: int = None, **context):
     """Логирует успешный MCP ответ."""
+    if not DEBUG_ENABLED:
+        return
     extra = {"tool": tool_name, "status": "success", **context}
     if count is not None:
         extra["results_count"] = count
-    logger.debug(f"MCP успех: {tool_name}", extra={"extra_data": extra})
+    logger.debug("MCP успех: %s", tool_name, extra={"extra_data": extra})
 
 
 def _log_mcp_error(tool_name: str, error: str, **context):
@@ -33,11 +56,12 @@ def _log_mcp_error(tool_name: str, error: str, **context):
 
 async def handle_find_1c_help(request: Find1CHelpRequest, es_client: ElasticsearchClient) -> MCPResponse:
     """Универсальный поиск справки по любому элементу 1С."""
-    _log_mcp_request("find_1c_help", query=request.query, limit=request.limit)
+    query, limit = request.query, request.limit
+    _log_mcp_request("find_1c_help", query=query, limit=limit)
     
     try:
-        search_service = SearchService(es_client)
-        results = await search_service.find_help_by_query(request.query, request.limit)
+        search_service = _get_search_service(es_client)
+        results = await search_service.find_help_by_query(query, limit)
         
         if results.get("error"):
             _log_mcp_error("find_1c_help", results["error"])
@@ -47,13 +71,10 @@ async def handle_find_1c_help(request: Find1CHelpRequest, es_client: Elasticsear
         
         if not search_results:
             _log_mcp_success("find_1c_help", count=0)
-            return mcp_formatter.create_not_found_response(request.query)
-        
-        content = [mcp_formatter.format_search_header(len(search_results), request.query)]
+            return mcp_formatter.create_not_found_response(query)
         
-        # Результаты
-        for i, result in enumerate(search_results, 1):
-            content.append(mcp_formatter.format_search_result(result, i))
+        # Заголовок и результаты возвращаются одним текстовым блоком
+        content = [mcp_formatter.format_search_results(search_results, query)]
         
         _log_mcp_success("find_1c_help", count=len(search_results))
         return mcp_formatter.create_success_response(content)
@@ -65,34 +86,37 @@ async def handle_find_1c_help(request: Find1CHelpRequest, es_client: Elasticsear
 
 async def handle_get_syntax_info(request: GetSyntaxInfoRequest, es_client: ElasticsearchClient) -> MCPResponse:
     """Получить полную техническую информацию об элементе."""
-    _log_mcp_request("get_syntax_info", element_name=request.element_name, 
-                    object_name=request.object_name, include_examples=request.include_examples)
+    element_name, object_name = request.element_name, request.object_name
+    include_examples = request.include_examples
+    _log_mcp_request("get_syntax_info", element_name=element_name, 
+                    object_name=object_name, include_examples=include_examples)
     
     try:
-        search_service = SearchService(es_client)
+        search_service = _get_search_service(es_client)
         result = await search_service.get_detailed_syntax_info(
-            request.element_name, 
-            request.object_name, 
-            request.include_examples
+            element_name, 
+            object_name, 
+            include_examples
         )
         
         if not result:
-            element_context = f" объекта '{request.object_name}'" if request.object_name else ""
+            element_context = f" объекта '{object_name}'" if object_name else ""
             _log_mcp_success("get_syntax_info", count=0)
-            return mcp_formatter.create_not_found_response(f"Элемент '{request.element_name}'{element_context}")
+            return mcp_formatter.create_not_found_response(f"Элемент '{element_name}'{element_context}")
         
         # Форматируем детальную информацию
         text = mcp_formatter.format_syntax_info(result)
         
         # Добавляем примеры если нужно
-        if request.include_examples and result.get('examples'):
-            examples = result['examples']
-            if isinstance(examples, list) and examples:
-                text += "💡 **Примеры:**\n"
+        examples = result.get('examples')
+        if include_examples and examples:
+            if isinstance(examples, list):
+                parts = [text, "💡 **Примеры:**\n"]
                 for example in examples[:2]:  # Максимум 2 примера
-                    text += f"   ```\n   {example}\n   ```\n"
+                    parts.append(f"   ```\n   {example}\n   ```\n")
+                text = "".join(parts)
         
-        _log_mcp_success("get_syntax_info", count=1, has_examples=bool(result.get('examples')))
+        _log_mcp_success("get_syntax_info", count=1, has_examples=bool(examples))
         return mcp_formatter.create_success_response([{
             "type": "text",
             "text": text
@@ -105,19 +129,20 @@ async def handle_get_syntax_info(request: GetSyntaxInfoRequest, es_client: Elast
 
 async def handle_get_quick_reference(request: GetQuickReferenceRequest, es_client: ElasticsearchClient) -> MCPResponse:
     """Получить краткую справку."""
-    _log_mcp_request("get_quick_reference", element_name=request.element_name, object_name=request.object_name)
+    element_name, object_name = request.element_name, request.object_name
+    _log_mcp_request("get_quick_reference", element_name=element_name, object_name=object_name)
     
     try:
-        search_service = SearchService(es_client)
+        search_service = _get_search_service(es_client)
         result = await search_service.get_detailed_syntax_info(
-            request.element_name, 
-            request.object_name, 
+            element_name, 
+            object_name, 
             include_examples=False
         )
         
         if not result:
             _log_mcp_success("get_quick_reference", count=0)
-            return mcp_formatter.create_not_found_response(f"⚡ Элемент '{request.element_name}'")
+            return mcp_formatter.create_not_found_response(f"⚡ Элемент '{element_name}'")
         
         text = mcp_formatter.format_quick_reference(result)
         
@@ -134,16 +159,18 @@ async def handle_get_quick_reference(request: GetQuickReferenceRequest, es_clien
 
 async def handle_search_by_context(request: SearchByContextRequest, es_client: ElasticsearchClient) -> MCPResponse:
     """Поиск с фильтром по контексту."""
-    _log_mcp_request("search_by_context", query=request.query, context=request.context, 
-                    object_name=request.object_name, limit=request.limit)
+    query, context = request.query, request.context
+    object_name, limit = request.object_name, request.limit
+    _log_mcp_request("search_by_context", query=query, context=context, 
+                    object_name=object_name, limit=limit)
     
     try:
-        search_service = SearchService(es_client)
+        search_service = _get_search_service(es_client)
         results = await search_service.search_with_context_filter(
-            request.query,
-            request.context, 
-            request.object_name,
-            request.limit
+            query,
+            context, 
+            object_name,
+            limit
         )
         
         if results.get("error"):
@@ -153,14 +180,13 @@ async def handle_search_by_context(request: SearchByContextRequest, es_client: E
         search_results = results.get("results", [])
         
         if not search_results:
-            context_name = {"global": "глобальном", "object": "объектном", "all": "любом"}
-            context_text = context_name.get(request.context, request.context)
-            _log_mcp_success("search_by_context", count=0, context=request.context)
-            return mcp_formatter.create_not_found_response(request.query, f"{context_text} контексте")
+            context_text = _CONTEXT_NAMES.get(context, context)
+            _log_mcp_success("search_by_context", count=0, context=context)
+            return mcp_formatter.create_not_found_response(query, f"{context_text} контексте")
         
-        text = mcp_formatter.format_context_search(search_results, request.query, request.context)
+        text = mcp_formatter.format_context_search(search_results, query, context)
         
-        _log_mcp_success("search_by_context", count=len(search_results), context=request.context)
+        _log_mcp_success("search_by_context", count=len(search_results), context=context)
         return mcp_formatter.create_success_response([{
             "type": "text",
             "text": text
@@ -173,13 +199,14 @@ async def handle_search_by_context(request: SearchByContextRequest, es_client: E
 
 async def handle_list_object_members(request: ListObjectMembersRequest, es_client: ElasticsearchClient) -> MCPResponse:
     """Получить список элементов объекта."""
-    _log_mcp_request("list_object_members", object_name=request.object_name, member_type=request.member_type, limit=request.limit)
+    object_name, member_type, limit = request.object_name, request.member_type, request.limit
+    _log_mcp_request("list_object_members", object_name=object_name, member_type=member_type, limit=limit)
     try:
-        search_service = SearchService(es_client)
+        search_service = _get_search_service(es_client)
         result = await search_service.get_object_members_list(
-            request.object_name,
-            request.member_type,
-            request.limit
+            object_name,
+            member_type,
+            limit
         )
 
         if result.get("error"):
@@ -193,11 +220,11 @@ async def handle_list_object_members(request: ListObjectMembersRequest, es_clien
 
         if total == 0:
             _log_mcp_success("list_object_members", count=0)
-            return mcp_formatter.create_not_found_response(f"Объект '{request.object_name}' не найден или не содержит элементов")
+            return mcp_formatter.create_not_found_response(f"Объект '{object_name}' не найден или не содержит элементов")
 
         text = mcp_formatter.format_object_members_list(
-            request.object_name,
-            request.member_type,
+            object_name,
+            member_type,
             methods,
             properties,
             events,
@@ -92,17 +92,9 @@ class BackgroundIndexingManager:
             if not Path(file_path).exists():
                 raise FileNotFoundError(f"Файл не найден: {file_path}")
             
-            # Парсим .hbk файл в отдельном потоке (не блокируем event loop)
-            from src.parsers.hbk_parser import HBKParser
-            parser = HBKParser()
-            
-            # Запускаем синхронный парсинг в executor
-            loop = asyncio.get_event_loop()
-            parsed_hbk = await loop.run_in_executor(
-                None,  # Использует default ThreadPoolExecutor
-                parser.parse_file,
-                file_path
-            )
+            # Парсим .hbk файл в отдельном процессе (не блокируем event loop)
+            from src.parsers.hbk_parser import parse_file_in_process
+            parsed_hbk = await parse_file_in_process(file_path)
             
             if not parsed_hbk or not parsed_hbk.documentation:
                 raise ValueError("Не удалось распарсить файл или документация пуста")
@@ -4,7 +4,9 @@ import sys
 import argparse
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from src.core.config import settings
 from src.core.logging import get_logger
@@ -19,7 +21,8 @@ from src.api.routes.metrics import router as metrics_router
 from src.api.routes.mcp import router as mcp_router
 
 # Import middleware and exception handlers
-from src.api.middleware.rate_limit import rate_limit_middleware
+from src.api.middleware.rate_limit import RateLimitMiddleware
+from src.api.middleware.health_interceptor import HealthCheckInterceptor
 from src.api.middleware.error_handler import (
     validation_exception_handler,
     parser_exception_handler,
@@ -61,15 +64,16 @@ async def lifespan(app: FastAPI):
 
 
 # Создаем приложение FastAPI
-app = FastAPI(
+fastapi_app = FastAPI(
     title="1C Syntax Helper MCP Server",
     description="MCP сервер для поиска по синтаксису 1С",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Добавляем CORS middleware
-app.add_middleware(
+fastapi_app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
@@ -78,27 +82,48 @@ app.add_middleware(
 )
 
 # Добавляем rate limiting middleware
-app.middleware("http")(rate_limit_middleware)
+fastapi_app.add_middleware(RateLimitMiddleware)
+
+# Сжимаем крупные ответы (/metrics, tools/list); добавлен после rate limiting,
+# поэтому оборачивает и ответы 429
+fastapi_app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Регистрируем обработчики исключений
-app.add_exception_handler(ValidationError, validation_exception_handler)
-app.add_exception_handler(HBKParserError, parser_exception_handler)
-app.add_exception_handler(Exception, general_exception_handler)
+fastapi_app.add_exception_handler(ValidationError, validation_exception_handler)
+fastapi_app.add_exception_handler(HBKParserError, parser_exception_handler)
+fastapi_app.add_exception_handler(Exception, general_exception_handler)
 
 # Подключаем роутеры
-app.include_router(health_router)
-app.include_router(index_router)
-app.include_router(metrics_router)
-app.include_router(mcp_router)
+fastapi_app.include_router(health_router)
+fastapi_app.include_router(index_router)
+fastapi_app.include_router(metrics_router)
+fastapi_app.include_router(mcp_router)
+
+# ASGI точка входа: liveness-пробы обслуживаются до стека FastAPI
+app = HealthCheckInterceptor(fastapi_app)
 
 
 if __name__ == "__main__":
+    from importlib.util import find_spec
     import uvicorn
     
+    # Та же проверка выполняется в lifespan; здесь она срабатывает до запуска процессов
+    if settings.server.workers > 1 and settings.should_reindex_on_startup:
+        sys.exit("--reindex и REINDEX_ON_STARTUP=true требуют SERVER_WORKERS=1")
+    
+    # reload и несколько процессов несовместимы: в режиме разработки один процесс
+    workers = 1 if settings.debug else settings.server.workers
+    
+    # uvloop и httptools заметно быстрее asyncio/h11, но uvloop недоступен на Windows
     uvicorn.run(
-        app,  # Передаем объект напрямую, а не строку
+        # reload и workers работают только со строкой импорта, иначе передаём объект
+        "src.main:app" if settings.debug or workers > 1 else app,
         host=settings.server.host,
         port=settings.server.port,
         log_level=settings.server.log_level.lower(),
-        reload=False  # Отключаем reload для прямой передачи объекта
+        access_log=settings.debug,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        reload=settings.debug,
+        workers=workers
     )
@@ -1,9 +1,13 @@
 
 """Парсер .hbk файлов (архивы документации 1С)."""
 
+import asyncio
+import multiprocessing
 import os
 import tempfile
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
@@ -407,6 +411,12 @@ class HBKParser:
             result = safe_subprocess_run(cmd, timeout=120)
             
             if result.returncode == 0:
+                # Нормализованное имя (с \ вместо /) -> запрошенное имя:
+                # соответствие для каждого файла находится одним обращением к словарю
+                requested = {}
+                for original_filename in filenames:
+                    requested.setdefault(original_filename.replace('/', '\\'), original_filename)
+                
                 # Читаем все извлеченные файлы
                 for root, dirs, files in os.walk(temp_dir):
                     for file in files:
@@ -417,14 +427,10 @@ class HBKParser:
                             # Нормализуем путь (заменяем / на \)
                             normalized_path = str(relative_path).replace('/', '\\')
                             
-                            # Ищем соответствие в списке запрошенных файлов
-                            for original_filename in filenames:
-                                # Нормализуем оригинальное имя
-                                normalized_original = original_filename.replace('/', '\\')
-                                if normalized_path == normalized_original:
-                                    with open(file_path, 'rb') as f:
-                                        extracted_files[original_filename] = f.read()
-                                    break
+                            original_filename = requested.get(normalized_path)
+                            if original_filename is not None:
+                                with open(file_path, 'rb') as f:
+                                    extracted_files[original_filename] = f.read()
                         except Exception as e:
                             logger.warning(f"Ошибка чтения файла {file_path}: {e}")
             else:
@@ -533,3 +539,50 @@ class HBKParser:
             logger.error(f"Ошибка извлечения файла {target_file_path} из {archive_path}: {e}")
             result.errors.append(f"Ошибка извлечения: {str(e)}")
             return result
+
+
+# Пул для разбора архивов: распаковка и разбор HTML нагружают CPU и под GIL
+# мешали бы event loop. Используется spawn, чтобы дочерний процесс заново
+# настроил логирование, а не унаследовал очередь без фонового потока записи.
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def parse_hbk_file(file_path: str) -> Optional[ParsedHBK]:
+    """Парсит .hbk файл (точка входа для дочернего процесса)."""
+    return HBKParser().parse_file(file_path)
+
+
+async def parse_file_in_process(file_path: str) -> Optional[ParsedHBK]:
+    """
+    Парсит .hbk файл в отдельном процессе, не блокируя event loop.
+    
+    Args:
+        file_path: Путь к .hbk файлу
+        
+    Returns:
+        Результат парсинга или None
+    """
+    global _parse_pool
+    
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_parse_pool, parse_hbk_file, file_path)
+    except BrokenProcessPool:
+        # Процесс упал: следующий вызов создаст новый пул
+        _parse_pool = None
+        raise
+
+
+def shutdown_parse_pool() -> None:
+    """Останавливает пул процессов парсинга."""
+    global _parse_pool
+    
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
@@ -135,6 +135,14 @@ class SearchService:
                     doc = doc.copy()
                     doc.pop('examples', None)
                 
+                # Приводим параметры к списку словарей один раз здесь,
+                # чтобы форматтер не проверял типы при каждом выводе
+                parameters = doc.get('parameters')
+                doc['parameters'] = (
+                    [param for param in parameters if isinstance(param, dict)]
+                    if isinstance(parameters, list) else []
+                )
+                
                 return doc
             
             return None
@@ -43,7 +43,7 @@ echo To force reindex, use: start_mcp_server.bat --reindex
 echo Для принудительной переиндексации: start_mcp_server.bat --reindex
 echo.
 
-venv\Scripts\python.exe src/main.py %*
+venv\Scripts\python.exe -m src.main %*
 
 echo Server stopped.
 echo Сервер остановлен.
@@ -44,7 +44,7 @@ Write-Host "Для принудительной переиндексации: .\
 Write-Host ""
 
 # Передаём все аргументы скрипта в main.py
-& ".\venv\Scripts\python.exe" src/main.py @args
+& ".\venv\Scripts\python.exe" -m src.main @args
 
 Write-Host "Server stopped." -ForegroundColor Red
 Write-Host "Сервер остановлен." -ForegroundColor Red
\ No newline at end of file
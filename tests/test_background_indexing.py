@@ -132,15 +132,15 @@ async def test_status_during_indexing(indexing_manager, mock_es_client, tmp_path
     test_file = tmp_path / "test.hbk"
     test_file.write_text("test content")
     
-    # Мокаем парсер и индексер с правильными путями
-    with patch('src.parsers.hbk_parser.HBKParser') as mock_parser, \
+    # Парсинг выполняется в отдельном процессе, поэтому мокаем точку вызова
+    # parse_file_in_process, а не HBKParser
+    mock_parsed = MagicMock()
+    mock_parsed.documentation = [MagicMock() for _ in range(100)]
+    
+    with patch('src.parsers.hbk_parser.parse_file_in_process',
+               AsyncMock(return_value=mock_parsed)), \
          patch('src.parsers.indexer.ElasticsearchIndexer') as mock_indexer:
         
-        # Настраиваем моки
-        mock_parsed = MagicMock()
-        mock_parsed.documentation = [MagicMock() for _ in range(100)]
-        mock_parser.return_value.parse_file.return_value = mock_parsed
-        
         mock_indexer_instance = mock_indexer.return_value
         
         # Делаем индексацию медленной чтобы успеть проверить статус
@@ -198,13 +198,13 @@ async def test_concurrent_indexing_blocked(indexing_manager, mock_es_client, tmp
     test_file = tmp_path / "test.hbk"
     test_file.write_text("test content")
     
-    with patch('src.parsers.hbk_parser.HBKParser') as mock_parser, \
+    mock_parsed = MagicMock()
+    mock_parsed.documentation = [MagicMock() for _ in range(10)]
+    
+    with patch('src.parsers.hbk_parser.parse_file_in_process',
+               AsyncMock(return_value=mock_parsed)), \
          patch('src.parsers.indexer.ElasticsearchIndexer') as mock_indexer:
         
-        mock_parsed = MagicMock()
-        mock_parsed.documentation = [MagicMock() for _ in range(10)]
-        mock_parser.return_value.parse_file.return_value = mock_parsed
-        
         # Медленная индексация
         async def slow_reindex(parsed, progress_callback=None):
             await asyncio.sleep(1)
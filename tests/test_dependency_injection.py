@@ -0,0 +1,73 @@
+"""Тесты контейнера dependency injection."""
+
+import pytest
+from src.core.dependency_injection import DIContainer, DIError
+
+
+class Database:
+    """Тестовая зависимость."""
+
+
+class Repository:
+    """Тестовый сервис с зависимостями в конструкторе."""
+
+    def __init__(self, db: Database, timeout: int = 30):
+        self.db = db
+        self.timeout = timeout
+
+
+def test_resolve_injects_registered_dependency():
+    """resolve внедряет зарегистрированную зависимость и значения по умолчанию."""
+    container = DIContainer()
+    db = Database()
+    container.register_singleton(Database, db)
+
+    repo = container.resolve(Repository)
+
+    assert repo.db is db
+    assert repo.timeout == 30
+
+    # Повторное разрешение использует кэш сигнатуры и дает тот же результат
+    assert container.resolve(Repository).db is db
+
+
+def test_resolve_missing_dependency_raises():
+    """resolve без зарегистрированной обязательной зависимости вызывает DIError."""
+    container = DIContainer()
+
+    with pytest.raises(DIError):
+        container.resolve(Repository)
+
+
+def test_get_returns_instances_and_calls_factories():
+    """get возвращает зарегистрированный экземпляр и вызывает фабрику на каждый запрос."""
+    container = DIContainer()
+    db = Database()
+    container.register_instance(Database, db)
+    container.register_factory(Repository, lambda: Repository(db))
+
+    assert container.get(Database) is db
+    assert container.get(Repository) is not container.get(Repository)
+
+    with pytest.raises(DIError):
+        container.get(Database, name="missing")
+
+
+def test_named_registration_replaces_type_entry():
+    """Регистрация под именем другого типа заменяет его прежнюю запись."""
+    container = DIContainer()
+    old_db, new_db = Database(), Database()
+    container.register_instance(Database, old_db)
+    container.register_instance(object, new_db, name="Database")
+
+    assert container.get(Database) is new_db
+
+
+def test_named_factory_replaces_type_singleton():
+    """Исправление в общем _register действует для всех видов регистрации."""
+    container = DIContainer()
+    db = Database()
+    container.register_singleton(Database, Database())
+    container.register_factory(object, lambda: db, name="Database")
+
+    assert container.get(Database) is db
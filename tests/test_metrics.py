@@ -0,0 +1,93 @@
+"""Тесты сборщика метрик."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.metrics import router as metrics_router
+from src.core.metrics import MetricsCollector, get_metrics_collector, reset_metrics
+
+
+def test_performance_stats_average():
+    """Среднее время ответа вычисляется по накопленной сумме."""
+    metrics = MetricsCollector()
+
+    metrics.update_performance_stats(success=True, response_time=0.1)
+    metrics.update_performance_stats(success=False, response_time=0.3)
+
+    stats = metrics.performance_stats
+    assert stats.total_requests == 2
+    assert stats.successful_requests == 1
+    assert stats.failed_requests == 1
+    assert stats.avg_response_time == pytest.approx(0.2)
+    assert stats.min_response_time == pytest.approx(0.1)
+    assert stats.max_response_time == pytest.approx(0.3)
+
+
+def test_empty_performance_stats_average():
+    """Без запросов среднее время ответа равно нулю."""
+    assert MetricsCollector().performance_stats.avg_response_time == 0.0
+
+
+@pytest.mark.asyncio
+async def test_counters_and_gauges():
+    """Счетчики накапливаются, gauge хранит последнее значение."""
+    metrics = MetricsCollector()
+
+    metrics.increment("requests")
+    metrics.increment("requests", 2)
+    metrics.set_gauge("memory", 10)
+    metrics.set_gauge("memory", 20)
+
+    all_metrics = await metrics.get_all_metrics()
+    assert all_metrics['counters']['requests'] == 3
+    assert all_metrics['gauges']['memory'] == 20
+
+
+@pytest.mark.asyncio
+async def test_timer_stats_with_eviction():
+    """Статистика таймера учитывает только последние history_size значений."""
+    metrics = MetricsCollector(history_size=3)
+
+    for duration in (5.0, 1.0, 2.0, 3.0):
+        metrics.record_timer("search", duration)
+
+    stats = await metrics.get_metric_stats("search")
+    assert stats['count'] == 3
+    assert stats['avg'] == pytest.approx(2.0)
+    assert stats['min'] == 1.0
+    assert stats['max'] == 3.0
+    assert stats['last'] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_clear_keeps_instance():
+    """clear обнуляет метрики, не заменяя сам сборщик."""
+    metrics = MetricsCollector()
+    metrics.increment("requests")
+    metrics.record_timer("search", 1.0)
+    metrics.update_performance_stats(success=True, response_time=0.1)
+
+    metrics.clear()
+    metrics.increment("requests")
+
+    all_metrics = await metrics.get_all_metrics()
+    assert all_metrics['counters'] == {"requests": 1}
+    assert all_metrics['timers'] == {}
+    assert metrics.performance_stats.total_requests == 0
+
+
+def test_metrics_endpoint_reflects_reset():
+    """После reset_metrics эндпоинт /metrics отдает обнуленные данные."""
+    app = FastAPI()
+    app.include_router(metrics_router)
+    client = TestClient(app)
+
+    get_metrics_collector().increment("test.reset")
+    assert client.get("/metrics").json()['metrics']['counters']['test.reset'] == 1
+
+    reset_metrics()
+
+    response = client.get("/metrics").json()
+    assert "test.reset" not in response['metrics']['counters']
+    assert response['performance']['total_requests'] == 0
@@ -3,12 +3,16 @@
 import asyncio
 import sys
 import pytest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.core.config import settings
-from src.parsers.hbk_parser import HBKParser
+from src.parsers import hbk_parser
+from src.parsers.hbk_parser import HBKParser, parse_file_in_process, shutdown_parse_pool
 
 
 @pytest.mark.asyncio
@@ -158,5 +162,37 @@ async def test_hbk_parsing():
         assert False, f"Исключение в тесте парсинга: {e}"
 
 
+class _BrokenPool:
+    """Пул, чей процесс упал: любая задача завершается BrokenProcessPool."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+@pytest.mark.asyncio
+async def test_broken_parse_pool_is_recreated(monkeypatch):
+    """После падения процесса пул сбрасывается и будет создан заново."""
+    monkeypatch.setattr(hbk_parser, "_parse_pool", _BrokenPool())
+
+    with pytest.raises(BrokenProcessPool):
+        await parse_file_in_process("test.hbk")
+
+    assert hbk_parser._parse_pool is None
+
+
+def test_shutdown_parse_pool(monkeypatch):
+    """shutdown_parse_pool останавливает пул без ожидания и сбрасывает его."""
+    pool = MagicMock()
+    monkeypatch.setattr(hbk_parser, "_parse_pool", pool)
+
+    shutdown_parse_pool()
+    shutdown_parse_pool()
+
+    pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert hbk_parser._parse_pool is None
+
+
 if __name__ == "__main__":
     asyncio.run(test_hbk_parsing())
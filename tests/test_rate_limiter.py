@@ -0,0 +1,71 @@
+"""Тесты ограничителя скорости запросов."""
+
+import pytest
+from src.core.rate_limiter import RateLimiter, RateLimitConfig, RateLimitExceeded
+
+
+def test_requests_within_limit_allowed():
+    """Запросы в пределах лимита проходят."""
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=3, requests_per_hour=100))
+
+    for _ in range(3):
+        assert limiter.check_rate_limit("127.0.0.1") is True
+
+
+def test_minute_limit_exceeded():
+    """Превышение минутного лимита вызывает RateLimitExceeded с retry_after."""
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=2, requests_per_hour=100))
+
+    limiter.check_rate_limit("127.0.0.1")
+    limiter.check_rate_limit("127.0.0.1")
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.check_rate_limit("127.0.0.1")
+
+    assert 0 < exc_info.value.retry_after <= 30
+
+    # Другие клиенты не затронуты
+    assert limiter.check_rate_limit("10.0.0.1") is True
+
+
+def test_non_blocking_mode_returns_false():
+    """Без блокировки превышение лимита возвращает False."""
+    limiter = RateLimiter(RateLimitConfig(
+        requests_per_minute=1, requests_per_hour=100, enable_blocking=False
+    ))
+
+    assert limiter.check_rate_limit("127.0.0.1") is True
+    assert limiter.check_rate_limit("127.0.0.1") is False
+
+
+def test_client_stats():
+    """Статистика клиента отражает израсходованные запросы."""
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=10, requests_per_hour=100))
+
+    for _ in range(4):
+        limiter.check_rate_limit("127.0.0.1")
+
+    stats = limiter.get_client_stats("127.0.0.1")
+    assert stats['requests_per_minute'] == 4
+    assert stats['remaining_minute'] == 6
+    assert stats['remaining_hour'] == 96
+    assert limiter.get_global_stats()['active_clients'] == 1
+
+
+def test_cleanup_removes_idle_clients():
+    """Очистка удаляет клиентов, чьи ведра уже полностью пополнились."""
+    limiter = RateLimiter(RateLimitConfig(requests_per_minute=10, requests_per_hour=100))
+    limiter.check_rate_limit("127.0.0.1")
+
+    _, _, last_refill = limiter._buckets["127.0.0.1"]
+    limiter._cleanup_idle_clients(last_refill + 1)
+    assert limiter.get_global_stats()['active_clients'] == 1
+
+    limiter._cleanup_idle_clients(last_refill + 3601)
+    assert limiter.get_global_stats()['active_clients'] == 0
+
+
+def test_zero_limit_rejected():
+    """Нулевой лимит отклоняется при создании конфигурации."""
+    with pytest.raises(ValueError):
+        RateLimitConfig(requests_per_minute=0)
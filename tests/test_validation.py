@@ -0,0 +1,44 @@
+"""Тесты валидации входных данных."""
+
+import orjson
+import pytest
+from src.core.validation import ValidationError, _json_size_exceeds, validate_json_payload
+
+
+def _assert_exact_boundary(payload):
+    """Оценка размера срабатывает ровно на длине orjson.dumps."""
+    actual = len(orjson.dumps(payload))
+    assert _json_size_exceeds(payload, actual - 1)
+    assert not _json_size_exceeds(payload, actual)
+
+
+def test_json_size_exact_for_mixed_payload():
+    """Для строк с экранированием, чисел и литералов оценка точна."""
+    _assert_exact_boundary({
+        "query": 'Сообщить("текст")',
+        "path": "C:\\1C\\help.hbk",
+        "limit": 10,
+        "score": -1.5,
+        "flags": [True, False, None],
+        "nested": {"empty": {}, "items": []},
+    })
+
+
+def test_json_size_numeric_array_not_overestimated():
+    """Массив небольших чисел оценивается по реальной длине, а не по 20 байт."""
+    payload = {"ids": list(range(100_000))}
+    _assert_exact_boundary(payload)
+
+    validate_json_payload(payload, max_size_mb=1)
+
+
+def test_json_size_control_chars_not_undercounted():
+    """Управляющие символы в строках не занижают оценку."""
+    payload = {"text": "строка\n\t\x01" * 100}
+    assert _json_size_exceeds(payload, len(orjson.dumps(payload)) - 1)
+
+
+def test_large_payload_rejected():
+    """Payload больше лимита отклоняется."""
+    with pytest.raises(ValidationError):
+        validate_json_payload({"text": "x" * (1024 * 1024)}, max_size_mb=1)